@@ -0,0 +1,129 @@
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Hashable, Iterable, Optional, Set, Tuple
+from dotenv import load_dotenv
+
+# Load environment variables
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+class ResponseCache:
+    """Bounded in-process LRU cache with a TTL and tag based invalidation.
+
+    Every entry is stored under one or more tags (e.g. ``post:<id>``) so that
+    write paths can drop exactly the entries a change affects.
+
+    Every invalidation moves ``epoch`` forward. A reader takes the epoch
+    before querying and passes it to ``set``, which drops the value if an
+    invalidation happened meanwhile: the read may predate the write.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 300):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any, Tuple[str, ...]]]" = OrderedDict()
+        self._tags: Dict[str, Set[Hashable]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.discarded = 0
+        self.epoch = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value, _ = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, tags: Iterable[str] = (), epoch: Optional[int] = None):
+        """Store value under key, evicting the least recently used entries if full.
+
+        With epoch, the value is only stored if nothing was invalidated since
+        that epoch was read.
+        """
+        if epoch is not None and epoch != self.epoch:
+            self.discarded += 1
+            return
+        if key in self._entries:
+            self._remove(key)
+
+        tags = tuple(tags)
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value, tags)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def invalidate(self, *tags: str) -> int:
+        """Drop every entry stored under any of the given tags"""
+        self.epoch += 1
+        keys = set()
+        for tag in tags:
+            keys.update(self._tags.get(tag, ()))
+        for key in keys:
+            self._remove(key)
+        self.invalidations += len(keys)
+        return len(keys)
+
+    def clear(self):
+        """Drop all entries"""
+        self.epoch += 1
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+        self._tags.clear()
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "discarded": self.discarded
+        }
+
+    def _remove(self, key: Hashable):
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+def make_key(route: str, **params) -> Tuple:
+    """Build a cache key from a route name and its normalized query parameters"""
+    normalized = []
+    for name, value in sorted(params.items()):
+        if value is None:
+            continue
+        normalized.append((name, getattr(value, 'value', value)))
+    return (route, tuple(normalized))
+
+# Cache for public blog reads
+blog_cache = ResponseCache(
+    max_entries=int(os.environ.get('BLOG_CACHE_MAX_ENTRIES', '1024')),
+    ttl_seconds=float(os.environ.get('BLOG_CACHE_TTL_SECONDS', '300'))
+)
@@ -0,0 +1,161 @@
+import asyncio
+import logging
+import os
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional
+
+from dotenv import load_dotenv
+from pymongo import ReturnDocument
+
+# Load environment variables
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+logger = logging.getLogger(__name__)
+
+# Collection holding one {_id: <collection name>, value: <generation>, changes: [...]}
+# document per watched collection; changes[-1] lists the ids written in generation value
+GENERATIONS_COLLECTION = "generations"
+
+# Generations whose changed ids are kept; a worker further behind refreshes everything
+CHANGE_LOG_LENGTH = int(os.environ.get('COHERENCE_CHANGE_LOG_LENGTH', '256'))
+
+# Writes touching more documents than this are recorded as "everything changed"
+MAX_CHANGE_IDS = int(os.environ.get('COHERENCE_MAX_CHANGE_IDS', '500'))
+
+# How often each worker reads the generations, and so how long another
+# worker's write can stay invisible to its caches
+COHERENCE_POLL_INTERVAL_SECONDS = float(os.environ.get('COHERENCE_POLL_INTERVAL_SECONDS', '1.0'))
+
+# listener(db, ids) with ids None when the changed documents are unknown
+Listener = Callable[[object, Optional[List[str]]], Awaitable[None]]
+
+class GenerationWatcher:
+    """Keeps in-process caches coherent across workers and hosts.
+
+    Every write to a watched collection bumps that collection's generation
+    with an atomic $inc and, in the same update, appends the ids it wrote
+    to a short change log. Each worker polls the generations, one small
+    query per interval, and when one has moved past what it last saw,
+    reads the log entries it missed and hands their ids to the listeners
+    registered for it, so they refresh just those documents.
+
+    Listeners only ever run from the polling task, never on a request. The
+    writing worker already refreshed its own caches, so its own bump just
+    advances what it has seen, unless another write slipped in between, in
+    which case the next poll picks both up.
+    """
+
+    def __init__(self, poll_interval: float = 1.0):
+        self.poll_interval = poll_interval
+        self.seen: Dict[str, int] = {}
+        self.polls = 0
+        self.invalidations = 0
+        self._listeners: Dict[str, List[Listener]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def on_change(self, collection: str, listener: Listener):
+        """Run listener(db, ids) whenever another worker writes to collection"""
+        self._listeners.setdefault(collection, []).append(listener)
+
+    async def bump(self, db, collection: str, ids: Optional[Iterable[str]] = None) -> int:
+        """Record a write to the given documents of collection, or to unknown ones.
+
+        Call it after the write succeeded.
+        """
+        ids = list(ids) if ids is not None else None
+        if ids is not None and len(ids) > MAX_CHANGE_IDS:
+            ids = None
+        doc = await db[GENERATIONS_COLLECTION].find_one_and_update(
+            {"_id": collection},
+            {
+                "$inc": {"value": 1},
+                "$push": {"changes": {"$each": [{"ids": ids}], "$slice": -CHANGE_LOG_LENGTH}}
+            },
+            projection={"value": 1},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        if doc["value"] == self.seen.get(collection, -1) + 1:
+            self.seen[collection] = doc["value"]
+        return doc["value"]
+
+    async def check(self, db):
+        """Read every watched generation and notify listeners of the ones that moved"""
+        if not self._listeners:
+            return
+        values = {collection: 0 for collection in self._listeners}
+        async for doc in db[GENERATIONS_COLLECTION].find({"_id": {"$in": list(values)}}, {"value": 1}):
+            values[doc["_id"]] = doc["value"]
+        self.polls += 1
+        for collection, value in values.items():
+            previous = self.seen.get(collection)
+            if previous is None:
+                self.seen[collection] = value
+            elif value > previous:
+                await self._catch_up(db, collection, previous, value)
+
+    async def _catch_up(self, db, collection: str, previous: int, value: int):
+        """Notify listeners of the ids written after generation previous"""
+        doc = await db[GENERATIONS_COLLECTION].find_one(
+            {"_id": collection}, {"value": 1, "changes": {"$slice": previous - value}}
+        )
+        changes = doc.get("changes", [])
+        # The log may have moved on since the poll, or be shorter than the gap
+        if doc["value"] - len(changes) > previous or any(change.get("ids") is None for change in changes):
+            ids = None
+        else:
+            missed = changes[len(changes) - (doc["value"] - previous):]
+            ids = list(dict.fromkeys(post_id for change in missed for post_id in change["ids"]))
+        if doc["value"] <= self.seen.get(collection, -1):
+            return
+        self.seen[collection] = doc["value"]
+        await self._notify(db, collection, ids)
+
+    async def _notify(self, db, collection: str, ids: Optional[List[str]]):
+        self.invalidations += 1
+        changed = "all documents" if ids is None else f"{len(ids)} documents"
+        logger.info(f"{collection} changed in another worker ({changed}), refreshing local caches")
+        for listener in self._listeners.get(collection, ()):
+            try:
+                await listener(db, ids)
+            except Exception as e:
+                logger.error(f"Cache refresh for {collection} failed: {str(e)}")
+
+    async def start(self, db):
+        """Take the current generations as the baseline and start polling"""
+        await self.check(db)
+        self._task = asyncio.create_task(self._run(db))
+        logger.info(f"Watching cache generations every {self.poll_interval}s")
+
+    async def stop(self):
+        """Stop polling"""
+        if not self.running:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    async def _run(self, db):
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await self.check(db)
+            except Exception as e:
+                logger.error(f"Failed to check cache generations: {str(e)}")
+
+    def stats(self) -> dict:
+        return {
+            "generations": dict(self.seen),
+            "polls": self.polls,
+            "invalidations": self.invalidations
+        }
+
+# Generation counters shared by every worker using the same database
+generations = GenerationWatcher(poll_interval=COHERENCE_POLL_INTERVAL_SECONDS)
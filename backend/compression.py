@@ -0,0 +1,128 @@
+import gzip
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from dotenv import load_dotenv
+from fastapi import Request, Response
+
+from cache import ResponseCache
+from conditional import set_validators
+
+try:
+    import brotli
+except ImportError:  # installed from requirements.txt; without it only gzip is offered
+    brotli = None
+
+# Load environment variables
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+# Bodies smaller than this are sent as they are
+MIN_COMPRESS_BYTES = int(os.environ.get('COMPRESS_MIN_BYTES', '1024'))
+
+# A variant has to save at least this fraction of the body to be worth sending
+MIN_SAVING = 0.1
+
+# Preferred first when a client accepts several equally
+ENCODINGS = ("br", "gzip") if brotli else ("gzip",)
+
+# File suffix of each precompressed variant written to disk
+SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+def compress(body: bytes, encoding: str, best: bool = False) -> bytes:
+    """Compress a body; best trades CPU for size and suits offline rendering"""
+    if encoding == "br":
+        return brotli.compress(body, quality=11 if best else 5)
+    return gzip.compress(body, compresslevel=9 if best else 6)
+
+def accepted_encodings(accept_encoding: str) -> Dict[str, float]:
+    """Parse an Accept-Encoding header into coding -> q-value"""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding.strip().lower()] = q
+    return accepted
+
+def negotiate(accept_encoding: Optional[str], available: Iterable[str]) -> Optional[str]:
+    """Pick the available encoding the client prefers, or None for identity"""
+    if not accept_encoding:
+        return None
+    accepted = accepted_encodings(accept_encoding)
+    best, best_q = None, 0.0
+    for encoding in ENCODINGS:
+        if encoding not in available:
+            continue
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+def worth_compressing(body: bytes) -> bool:
+    return len(body) >= MIN_COMPRESS_BYTES
+
+class EncodedBody:
+    """A rendered body with its compressed variants, each built on first request"""
+
+    def __init__(self, identity: bytes):
+        self.identity = identity
+        self._variants: Dict[str, Optional[bytes]] = {}
+
+    @property
+    def available(self) -> Iterable[str]:
+        if not worth_compressing(self.identity):
+            return ()
+        # Encodings already tried and found not to pay off are left out
+        return [encoding for encoding in ENCODINGS if self._variants.get(encoding, b"") is not None]
+
+    def variant(self, encoding: str) -> Optional[bytes]:
+        if encoding not in self._variants:
+            compressed = compress(self.identity, encoding)
+            worthwhile = len(compressed) <= len(self.identity) * (1 - MIN_SAVING)
+            self._variants[encoding] = compressed if worthwhile else None
+        return self._variants[encoding]
+
+# Rendered bodies keyed by their ETag; an ETag names exactly one body, so
+# entries never need invalidating and simply age out
+encoded_bodies = ResponseCache(
+    max_entries=int(os.environ.get('COMPRESSED_CACHE_MAX_ENTRIES', '1024')),
+    ttl_seconds=float(os.environ.get('BLOG_CACHE_TTL_SECONDS', '300'))
+)
+
+def encoded_response(
+    request: Request, etag: str, render, last_modified: Optional[datetime] = None, media_type: str = "application/json"
+) -> Response:
+    """Respond with the cached body for etag in the best encoding the client accepts.
+
+    render() builds the identity body on a cache miss. Compressed variants
+    carry a weak ETag since their bytes differ from the identity body.
+    """
+    body = encoded_bodies.get(etag)
+    if body is None:
+        body = EncodedBody(render())
+        encoded_bodies.set(etag, body)
+
+    headers = {"Vary": "Accept-Encoding"}
+    content = body.identity
+    encoding = negotiate(request.headers.get("accept-encoding"), body.available)
+    while encoding:
+        compressed = body.variant(encoding)
+        if compressed is not None:
+            content = compressed
+            headers["Content-Encoding"] = encoding
+            break
+        encoding = negotiate(request.headers.get("accept-encoding"), body.available)
+    response = Response(content, media_type=media_type, headers=headers)
+    set_validators(response, f"W/{etag}" if "Content-Encoding" in headers else etag, last_modified)
+    return response
@@ -0,0 +1,57 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request, Response
+
+# Bump when the serialized shape of responses changes so that clients
+# holding validators from an older release refetch.
+ETAG_VERSION = "2"
+
+def make_etag(*parts) -> str:
+    """Build a strong entity tag from the values a response is derived from"""
+    digest = hashlib.sha1(ETAG_VERSION.encode())
+    for part in parts:
+        digest.update(b"\x1f")
+        digest.update(str(part).encode())
+    return f'"{digest.hexdigest()}"'
+
+def http_date(value: datetime) -> str:
+    """Format a naive UTC datetime as an HTTP date"""
+    return format_datetime(value.replace(tzinfo=timezone.utc, microsecond=0), usegmt=True)
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """Evaluate If-None-Match, falling back to If-Modified-Since (RFC 7232 section 6)"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        # If-None-Match uses the weak comparison function
+        candidates = [tag.strip() for tag in if_none_match.split(",")]
+        return etag in [tag[2:] if tag.startswith("W/") else tag for tag in candidates]
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return last_modified.replace(tzinfo=timezone.utc, microsecond=0) <= since
+
+    return False
+
+def set_validators(response: Response, etag: str, last_modified: Optional[datetime] = None):
+    """Attach validators so clients and CDNs can revalidate instead of refetching"""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    if last_modified is not None:
+        response.headers["Last-Modified"] = http_date(last_modified)
+
+def not_modified(etag: str, last_modified: Optional[datetime] = None) -> Response:
+    """Build an empty 304 response carrying the current validators"""
+    response = Response(status_code=304)
+    set_validators(response, etag, last_modified)
+    return response
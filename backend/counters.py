@@ -0,0 +1,132 @@
+import asyncio
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+# Document in the counters collection holding the contact totals
+CONTACT_STATS_ID = "contacts"
+
+async def increment_contact_stats(db, deltas: Dict[str, int]):
+    """Apply per-status deltas to the contact counters in one atomic update.
+
+    Call it after the write it accounts for. While no counters exist yet,
+    e.g. on the first write after deploying onto existing data, they are
+    built from the collection instead, which already includes the write.
+    """
+    merged = Counter()
+    for status, delta in deltas.items():
+        merged[getattr(status, "value", status)] += delta
+    deltas = {status: delta for status, delta in merged.items() if delta}
+    if not deltas:
+        return
+
+    increments = {f"by_status.{status}": delta for status, delta in deltas.items()}
+    increments["total"] = sum(deltas.values())
+    result = await db.counters.update_one(
+        {"_id": CONTACT_STATS_ID},
+        {"$inc": increments, "$set": {"updated_at": datetime.utcnow()}}
+    )
+    if result.matched_count == 0:
+        await reconcile_contact_stats(db)
+
+def count_statuses(contacts: Iterable[dict]) -> Dict[str, int]:
+    """Per-status deltas for a batch of newly inserted contacts"""
+    return dict(Counter(getattr(contact["status"], "value", contact["status"]) for contact in contacts))
+
+async def reconcile_contact_stats(db) -> dict:
+    """Rebuild the contact counters from the contacts collection"""
+    pipeline = [{"$group": {"_id": "$status", "count": {"$sum": 1}}}]
+    status_counts = await db.contacts.aggregate(pipeline).to_list(length=None)
+
+    by_status = {getattr(item["_id"], "value", item["_id"]): item["count"] for item in status_counts}
+    stats = {
+        "total": sum(by_status.values()),
+        "by_status": by_status,
+        "updated_at": datetime.utcnow()
+    }
+    await db.counters.replace_one({"_id": CONTACT_STATS_ID}, stats, upsert=True)
+    return stats
+
+async def load_contact_stats(db) -> dict:
+    """Read the contact counters, building them on first use"""
+    stats = await db.counters.find_one({"_id": CONTACT_STATS_ID})
+    if stats is None:
+        stats = await reconcile_contact_stats(db)
+    return stats
+
+# Document in the counters collection holding published post counts per category and tag
+BLOG_FACETS_ID = "blog_facets"
+FACETS = ("categories", "tags")
+
+def _facet_key(value: str) -> str:
+    """Escape a facet value for use as a field name; tags such as "Node.js" contain dots"""
+    return value.replace("%", "%25").replace(".", "%2E").replace("$", "%24")
+
+def _facet_value(key: str) -> str:
+    return key.replace("%24", "$").replace("%2E", ".").replace("%25", "%")
+
+def post_facets(post: Optional[dict]) -> Counter:
+    """Facet counts one post contributes: nothing unless it is published"""
+    counts = Counter()
+    if not post or not post.get("published"):
+        return counts
+    counts["total"] += 1
+    category = getattr(post.get("category"), "value", post.get("category"))
+    if category:
+        counts[("categories", category)] += 1
+    for tag in post.get("tags") or ():
+        if tag:
+            counts[("tags", tag)] += 1
+    return counts
+
+def facet_deltas(before: Optional[dict] = None, after: Optional[dict] = None) -> Counter:
+    """Facet deltas for a post going from before to after; None means absent"""
+    deltas = post_facets(after)
+    deltas.subtract(post_facets(before))
+    return deltas
+
+async def increment_blog_facets(db, deltas: Counter):
+    """Apply facet deltas to the blog counters in one atomic update.
+
+    Like the contact counters, they are rebuilt from the posts instead
+    while no counters document exists yet.
+    """
+    increments = {
+        "total" if key == "total" else f"{key[0]}.{_facet_key(key[1])}": delta
+        for key, delta in deltas.items() if delta
+    }
+    if not increments:
+        return
+    result = await db.counters.update_one(
+        {"_id": BLOG_FACETS_ID},
+        {"$inc": increments, "$set": {"updated_at": datetime.utcnow()}}
+    )
+    if result.matched_count == 0:
+        await reconcile_blog_facets(db)
+
+async def reconcile_blog_facets(db) -> dict:
+    """Rebuild the blog facet counters from the published posts"""
+    published = {"$match": {"published": True}}
+    categories, tags, total = await asyncio.gather(
+        db.blog_posts.aggregate([published, {"$group": {"_id": "$category", "count": {"$sum": 1}}}]).to_list(length=None),
+        db.blog_posts.aggregate([published, {"$unwind": "$tags"}, {"$group": {"_id": "$tags", "count": {"$sum": 1}}}]).to_list(length=None),
+        db.blog_posts.count_documents({"published": True})
+    )
+    stats = {
+        "total": total,
+        "categories": {_facet_key(item["_id"]): item["count"] for item in categories if item["_id"]},
+        "tags": {_facet_key(item["_id"]): item["count"] for item in tags if item["_id"]},
+        "updated_at": datetime.utcnow()
+    }
+    await db.counters.replace_one({"_id": BLOG_FACETS_ID}, stats, upsert=True)
+    return stats
+
+async def load_blog_facets(db) -> dict:
+    """Read the blog facet counters, building them on first use"""
+    stats = await db.counters.find_one({"_id": BLOG_FACETS_ID})
+    if stats is None:
+        stats = await reconcile_blog_facets(db)
+    return {
+        "total": stats.get("total", 0),
+        **{facet: {_facet_value(key): count for key, count in stats.get(facet, {}).items()} for facet in FACETS}
+    }
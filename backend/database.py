@@ -1,9 +1,17 @@
 import os
 import asyncio
+import hashlib
+import json
+import time
+from datetime import datetime
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import IndexModel
 from pathlib import Path
 from dotenv import load_dotenv
 
+from metrics import command_listener, pool_listener
+from rendering import derive_fields
+
 # Load environment variables
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -12,6 +20,35 @@ load_dotenv(ROOT_DIR / '.env')
 mongo_url = os.environ.get('MONGO_URL', 'mongodb://localhost:27017')
 db_name = os.environ.get('DB_NAME', 'portfolio_db')
 
+# Connection pool and timeout settings. Each uvicorn worker holds its own
+# pool, so MONGO_MAX_POOL_SIZE is per worker process. Unset options keep
+# the driver defaults.
+CLIENT_OPTIONS = {
+    'maxPoolSize': ('MONGO_MAX_POOL_SIZE', int),
+    'minPoolSize': ('MONGO_MIN_POOL_SIZE', int),
+    'maxIdleTimeMS': ('MONGO_MAX_IDLE_TIME_MS', int),
+    'waitQueueTimeoutMS': ('MONGO_WAIT_QUEUE_TIMEOUT_MS', int),
+    'serverSelectionTimeoutMS': ('MONGO_SERVER_SELECTION_TIMEOUT_MS', int),
+    'connectTimeoutMS': ('MONGO_CONNECT_TIMEOUT_MS', int),
+    'socketTimeoutMS': ('MONGO_SOCKET_TIMEOUT_MS', int),
+    # Comma separated, e.g. "zstd,snappy,zlib"; zstd and snappy need the
+    # zstandard and python-snappy packages, otherwise the driver skips them
+    'compressors': ('MONGO_COMPRESSORS', str),
+    # primary, primaryPreferred, secondary, secondaryPreferred or nearest
+    'readPreference': ('MONGO_READ_PREFERENCE', str),
+}
+
+HEALTH_PING_TIMEOUT_SECONDS = float(os.environ.get('HEALTH_PING_TIMEOUT_MS', '1000')) / 1000
+
+def client_options() -> dict:
+    """Motor client options taken from the environment"""
+    options = {}
+    for option, (env_var, parse) in CLIENT_OPTIONS.items():
+        value = os.environ.get(env_var)
+        if value:
+            options[option] = parse(value)
+    return options
+
 # Global database client
 client = None
 database = None
@@ -19,7 +56,11 @@ database = None
 async def connect_to_mongo():
     """Create database connection"""
     global client, database
-    client = AsyncIOMotorClient(mongo_url)
+    client = AsyncIOMotorClient(
+        mongo_url,
+        event_listeners=[command_listener, pool_listener],
+        **client_options()
+    )
     database = client[db_name]
     
     # Test connection
@@ -37,6 +78,12 @@ async def close_mongo_connection():
         client.close()
         print("✅ Disconnected from MongoDB")
 
+async def ping_database(timeout: float = HEALTH_PING_TIMEOUT_SECONDS) -> float:
+    """Ping the server and return the round trip time in seconds"""
+    started = time.perf_counter()
+    await asyncio.wait_for(client.admin.command('ping'), timeout=timeout)
+    return time.perf_counter() - started
+
 def get_database():
     """Dependency to get database instance"""
     return database
@@ -51,37 +98,102 @@ async def get_blog_posts_collection():
 async def get_projects_collection():
     return database.projects
 
-# Initialize database indexes
+# Index specs per collection. Any change here or in LEGACY_INDEXES changes
+# the fingerprint, so the next startup rebuilds them.
+INDEXES = {
+    "contacts": [
+        IndexModel("id", unique=True),
+        # Listing, optionally filtered by status, newest first
+        IndexModel([("status", 1), ("created_at", -1), ("id", -1)]),
+        IndexModel([("created_at", -1), ("id", -1)]),
+        # Exports, resumed from an updated_at watermark
+        IndexModel([("updated_at", 1), ("id", 1)]),
+    ],
+    "blog_posts": [
+        IndexModel("id", unique=True),
+        IndexModel("slug", unique=True),
+        # Listings filter on published and/or category and sort newest first
+        IndexModel([("published", 1), ("category", 1), ("created_at", -1), ("id", -1)]),
+        IndexModel([("published", 1), ("created_at", -1), ("id", -1)]),
+        IndexModel([("category", 1), ("created_at", -1), ("id", -1)]),
+        IndexModel([("created_at", -1), ("id", -1)]),
+        IndexModel([("updated_at", 1), ("id", 1)]),
+        # Text search covers the same fields as substring search, plus content
+        IndexModel([("title", "text"), ("excerpt", "text"), ("content", "text"), ("tags", "text")]),
+    ],
+    "projects": [
+        # The snapshot loads the whole collection; writes address projects by id
+        IndexModel("id", unique=True),
+    ],
+}
+
+# Indexes from earlier releases that no query uses any more
+LEGACY_INDEXES = {
+    "contacts": ["email_1", "status_1", "created_at_1"],
+    "blog_posts": ["category_1", "published_1", "created_at_1", "title_text_excerpt_text_content_text"],
+    "projects": ["category_1", "featured_1", "order_1", "created_at_1"],
+}
+
+# Where the fingerprint of the last successful index build is stored
+META_COLLECTION = "meta"
+INDEX_FINGERPRINT_ID = "indexes"
+
+def index_fingerprint() -> str:
+    """Stable hash of the index specs in INDEXES and the names in LEGACY_INDEXES"""
+    specs = {
+        name: [list(index.document["key"].items()) + sorted(
+            (option, value) for option, value in index.document.items() if option not in ("key", "name")
+        ) for index in indexes]
+        for name, indexes in INDEXES.items()
+    }
+    specs = {"indexes": specs, "legacy": LEGACY_INDEXES}
+    return hashlib.sha1(json.dumps(specs, sort_keys=True, default=str).encode()).hexdigest()
+
+async def create_collection_indexes(name: str):
+    """Drop a collection's legacy indexes and create its indexes with one createIndexes command.
+
+    Legacy indexes go first: a collection holds only one text index, so a
+    replaced one has to be gone before its successor can be built.
+    """
+    collection = database[name]
+    existing = await collection.index_information()
+    for index_name in LEGACY_INDEXES.get(name, []):
+        if index_name in existing:
+            await collection.drop_index(index_name)
+    await collection.create_indexes(INDEXES[name])
+
 async def create_indexes():
-    """Create database indexes for optimal performance"""
+    """Create all database indexes, building the collections concurrently"""
+    await asyncio.gather(*(create_collection_indexes(name) for name in INDEXES))
+
+async def ensure_indexes(force: bool = False) -> bool:
+    """Create indexes unless the stored fingerprint shows they are current.
+
+    Returns True when indexes were built.
+    """
+    fingerprint = index_fingerprint()
     try:
-        # Contact indexes
-        await database.contacts.create_index("email")
-        await database.contacts.create_index("created_at")
-        await database.contacts.create_index("status")
-        
-        # Blog indexes
-        await database.blog_posts.create_index("slug", unique=True)
-        await database.blog_posts.create_index("category")
-        await database.blog_posts.create_index("published")
-        await database.blog_posts.create_index("created_at")
-        await database.blog_posts.create_index([("title", "text"), ("excerpt", "text"), ("content", "text")])
-        
-        # Project indexes
-        await database.projects.create_index("category")
-        await database.projects.create_index("featured")
-        await database.projects.create_index("order")
-        await database.projects.create_index("created_at")
-        
+        if not force:
+            stored = await database[META_COLLECTION].find_one({"_id": INDEX_FINGERPRINT_ID})
+            if stored and stored.get("fingerprint") == fingerprint:
+                print("✅ Database indexes are current, skipping index build")
+                return False
+
+        await create_indexes()
+        await database[META_COLLECTION].replace_one(
+            {"_id": INDEX_FINGERPRINT_ID},
+            {"fingerprint": fingerprint, "built_at": datetime.utcnow()},
+            upsert=True
+        )
         print("✅ Database indexes created successfully!")
+        return True
     except Exception as e:
         print(f"❌ Failed to create indexes: {e}")
+        return False
 
 # Seed data for initial setup
 async def seed_database():
     """Seed the database with initial data"""
-    from datetime import datetime
-    
     # Check if data already exists
     contacts_count = await database.contacts.count_documents({})
     blog_count = await database.blog_posts.count_documents({})
@@ -186,6 +298,12 @@ async def seed_database():
         }
     ]
     
+    # Store the fields derived from content, keeping the hand-written read times
+    for post in blog_posts:
+        read_time = post['read_time']
+        post.update(derive_fields(post['content']))
+        post['read_time'] = read_time
+    
     # Insert seed data
     try:
         await database.blog_posts.insert_many(blog_posts)
@@ -0,0 +1,177 @@
+import asyncio
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, List, Optional
+from dotenv import load_dotenv
+from pymongo.errors import BulkWriteError
+
+from counters import count_statuses, increment_contact_stats
+
+# Load environment variables
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of the queue during shutdown
+_STOP = object()
+
+class BufferFull(Exception):
+    """Raised when a submission cannot be queued before the enqueue timeout"""
+
+class WriteBehindBuffer:
+    """Queues documents in memory and writes them in batches with insert_many.
+
+    A background task flushes whenever batch_size documents are waiting or
+    flush_interval seconds have passed since the first one arrived. When the
+    queue is full, submit waits up to enqueue_timeout seconds for room and
+    then raises BufferFull, pushing the backpressure back to the caller.
+    """
+
+    def __init__(
+        self,
+        collection_name: str,
+        enabled: bool = False,
+        max_queue: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 0.5,
+        enqueue_timeout: float = 1.0,
+        max_retries: int = 3,
+        after_flush: Optional[Callable[[object, List[dict]], Awaitable[None]]] = None
+    ):
+        self.collection_name = collection_name
+        self.enabled = enabled
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+        self.max_retries = max_retries
+        self.after_flush = after_flush
+        self.flushed = 0
+        self.failed = 0
+        self._db = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self, db):
+        """Start the background flusher"""
+        self._db = db
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Write-behind buffer for {self.collection_name} started")
+
+    async def submit(self, doc: dict):
+        """Queue a document for insertion"""
+        if not self.running:
+            raise RuntimeError(f"Write-behind buffer for {self.collection_name} is not running")
+        try:
+            await asyncio.wait_for(self._queue.put(doc), timeout=self.enqueue_timeout)
+        except asyncio.TimeoutError:
+            raise BufferFull(f"Write-behind queue for {self.collection_name} is full")
+
+    async def stop(self):
+        """Flush everything still queued and stop the background flusher"""
+        if not self.running:
+            return
+        await self._queue.put(_STOP)
+        await self._task
+        logger.info(
+            f"Write-behind buffer for {self.collection_name} drained "
+            f"({self.flushed} written, {self.failed} failed)"
+        )
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "queued": self._queue.qsize() if self._queue else 0,
+            "max_queue": self.max_queue,
+            "flushed": self.flushed,
+            "failed": self.failed
+        }
+
+    async def _run(self):
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is _STOP:
+                break
+
+            # Collect until the batch is full or the first item is old enough
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[dict]):
+        collection = self._db[self.collection_name]
+        pending = batch
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                await collection.insert_many(pending, ordered=False)
+                pending = []
+                break
+            except BulkWriteError as e:
+                # Documents that already made it in on an earlier attempt
+                # come back as duplicate keys and count as written
+                pending = [
+                    pending[error["index"]] for error in e.details.get("writeErrors", [])
+                    if error.get("code") != 11000
+                ]
+                if not pending:
+                    break
+                error_message = str(e)
+            except Exception as e:
+                error_message = str(e)
+
+            if attempt < self.max_retries:
+                logger.warning(f"Retrying insert of {len(pending)} {self.collection_name} documents: {error_message}")
+                await asyncio.sleep(0.1 * 2 ** attempt)
+
+        if pending:
+            self.failed += len(pending)
+            logger.error(
+                f"Dropping {len(pending)} {self.collection_name} documents after "
+                f"{self.max_retries} failed inserts: {error_message}"
+            )
+
+        pending_ids = {id(doc) for doc in pending}
+        written = [doc for doc in batch if id(doc) not in pending_ids]
+        self.flushed += len(written)
+
+        if written and self.after_flush is not None:
+            try:
+                await self.after_flush(self._db, written)
+            except Exception as e:
+                logger.error(f"Error after flushing {self.collection_name}: {str(e)}")
+
+async def _count_flushed_contacts(db, contacts: List[dict]):
+    await increment_contact_stats(db, count_statuses(contacts))
+
+# Optional buffered ingestion for contact form submissions
+contact_buffer = WriteBehindBuffer(
+    "contacts",
+    after_flush=_count_flushed_contacts,
+    enabled=os.environ.get('CONTACT_WRITE_BEHIND', 'false').lower() == 'true',
+    max_queue=int(os.environ.get('CONTACT_WRITE_BEHIND_QUEUE_SIZE', '10000')),
+    batch_size=int(os.environ.get('CONTACT_WRITE_BEHIND_BATCH_SIZE', '500')),
+    flush_interval=int(os.environ.get('CONTACT_WRITE_BEHIND_FLUSH_MS', '500')) / 1000,
+    enqueue_timeout=int(os.environ.get('CONTACT_WRITE_BEHIND_ENQUEUE_TIMEOUT_MS', '1000')) / 1000
+)
@@ -0,0 +1,91 @@
+"""Maintenance commands, run from the backend directory: python manage.py --help"""
+import asyncio
+from pathlib import Path
+
+import typer
+
+import database
+from coherence import generations
+from counters import reconcile_blog_facets, reconcile_contact_stats
+from publish import blog_snapshots
+from rendering import backfill_derived_fields
+
+app = typer.Typer(help="Portfolio API maintenance commands", no_args_is_help=True)
+
+@app.callback()
+def main():
+    """Portfolio API maintenance commands"""
+
+def run_with_database(command):
+    """Run an async command against a fresh database connection"""
+    async def runner():
+        await database.connect_to_mongo()
+        try:
+            return await command(database.get_database())
+        finally:
+            await database.close_mongo_connection()
+    return asyncio.run(runner())
+
+@app.command("seed")
+def seed_command():
+    """Insert the sample blog posts and projects into an empty database"""
+    async def seed(db):
+        await database.seed_database()
+        # Running workers drop anything they cached from the empty collections
+        await generations.bump(db, "blog_posts")
+        await generations.bump(db, "projects")
+    run_with_database(seed)
+
+@app.command("ensure-indexes")
+def ensure_indexes_command(
+    force: bool = typer.Option(False, "--force", help="Rebuild even if the stored fingerprint matches")
+):
+    """Create the database indexes unless they are already current"""
+    run_with_database(lambda db: database.ensure_indexes(force=force))
+
+@app.command("publish")
+def publish_command(
+    directory: str = typer.Option(None, "--dir", help="Snapshot directory, defaults to BLOG_SNAPSHOT_DIR")
+):
+    """Render static JSON snapshots of every published post and listing page"""
+    if directory:
+        blog_snapshots.directory = Path(directory)
+    if not blog_snapshots.enabled:
+        typer.echo("❌ Set BLOG_SNAPSHOT_DIR or pass --dir")
+        raise typer.Exit(code=1)
+    stats = run_with_database(blog_snapshots.publish_all)
+    typer.echo(f"✅ Published {stats['posts']} posts and {stats['listings']} listings to {blog_snapshots.directory}, removed {stats['removed']}")
+
+@app.command("backfill-derived")
+def backfill_derived_command(
+    batch_size: int = typer.Option(500, help="Posts written per bulk update"),
+    force: bool = typer.Option(False, "--force", help="Recompute posts whose content hash already matches")
+):
+    """Store rendered HTML, TOC, word count and read time on existing posts"""
+    async def backfill(db):
+        stats = await backfill_derived_fields(db, batch_size=batch_size, force=force)
+        if stats['updated']:
+            await generations.bump(db, "blog_posts")
+        return stats
+    stats = run_with_database(backfill)
+    typer.echo(f"✅ Derived fields backfilled: {stats['updated']} of {stats['scanned']} posts updated")
+    if stats['updated'] and blog_snapshots.enabled:
+        typer.echo("Run 'python manage.py publish' to refresh the static snapshots")
+
+@app.command("reconcile-contact-stats")
+def reconcile_contact_stats_command():
+    """Rebuild the contact status counters from the contacts collection"""
+    stats = run_with_database(reconcile_contact_stats)
+    typer.echo(f"✅ Contact stats reconciled: {stats['total']} contacts {stats['by_status']}")
+
+@app.command("reconcile-blog-facets")
+def reconcile_blog_facets_command():
+    """Rebuild the blog category and tag counters from the published posts"""
+    stats = run_with_database(reconcile_blog_facets)
+    typer.echo(
+        f"✅ Blog facets reconciled: {stats['total']} published posts, "
+        f"{len(stats['categories'])} categories, {len(stats['tags'])} tags"
+    )
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,292 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Tuple
+from dotenv import load_dotenv
+from pymongo import monitoring
+
+# Load environment variables
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+# Latency buckets in seconds
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Commands slower than this are counted as slow queries
+SLOW_COMMAND_SECONDS = float(os.environ.get('MONGO_SLOW_COMMAND_MS', '100')) / 1000
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+class Histogram:
+    """Labelled histogram family in the Prometheus exposition format.
+
+    Observations may come from pymongo's monitoring threads as well as the
+    event loop, so updates are guarded by a lock.
+    """
+
+    def __init__(self, name: str, documentation: str, label_names: Tuple[str, ...], buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self.buckets = tuple(buckets)
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: Tuple[str, ...], value: float):
+        with self._lock:
+            # One slot per bucket, then +Inf, sum and count
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0.0] * (len(self.buckets) + 3)
+            series[bisect_left(self.buckets, value)] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {labels: list(values) for labels, values in self._series.items()}
+        for labels, values in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), values):
+                cumulative += count
+                le = f'le="{bound}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, labels, le)} {_format_value(cumulative)}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, labels)} {values[-2]!r}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, labels)} {_format_value(values[-1])}")
+        return lines
+
+class Counter:
+    """Labelled counter family in the Prometheus exposition format"""
+
+    def __init__(self, name: str, documentation: str, label_names: Tuple[str, ...]):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self._series: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: Tuple[str, ...], amount: float = 1):
+        with self._lock:
+            self._series[labels] = self._series.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            series = dict(self._series)
+        for labels, value in sorted(series.items()):
+            lines.append(f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}")
+        return lines
+
+http_request_duration = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template",
+    ("method", "route", "status")
+)
+mongo_command_duration = Histogram(
+    "mongo_command_duration_seconds", "MongoDB command latency by collection and command",
+    ("collection", "command")
+)
+mongo_command_failures = Counter(
+    "mongo_command_failures_total", "MongoDB commands that returned an error",
+    ("collection", "command")
+)
+mongo_pool_checkout_wait = Histogram(
+    "mongo_pool_checkout_wait_seconds", "Time spent waiting for a pooled MongoDB connection",
+    ("address",)
+)
+mongo_slow_commands = Counter(
+    "mongo_slow_commands_total", f"MongoDB commands slower than {SLOW_COMMAND_SECONDS * 1000:g}ms",
+    ("collection", "command")
+)
+
+METRICS = [
+    http_request_duration, mongo_command_duration, mongo_command_failures,
+    mongo_slow_commands, mongo_pool_checkout_wait
+]
+
+# Callables returning (name, type, help, samples) for values owned elsewhere,
+# where samples is a list of (labels dict, value)
+_collectors: List[Callable[[], Iterable[Tuple[str, str, str, List[Tuple[dict, float]]]]]] = []
+
+def register_collector(collector: Callable[[], Iterable[Tuple[str, str, str, List[Tuple[dict, float]]]]]):
+    """Expose values computed on demand, such as cache counters"""
+    _collectors.append(collector)
+
+def render_metrics() -> str:
+    """Render every metric in the Prometheus text exposition format"""
+    lines: List[str] = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    for collector in _collectors:
+        for name, metric_type, documentation, samples in collector():
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for labels, value in samples:
+                names = tuple(labels)
+                lines.append(f"{name}{_format_labels(names, tuple(labels[n] for n in names))} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+class MongoCommandListener(monitoring.CommandListener):
+    """Records the duration of every command the driver sends, per collection"""
+
+    def __init__(self):
+        self._pending: Dict[Tuple[int, object], Tuple[str, str]] = {}
+        self._lock = threading.Lock()
+
+    def started(self, event):
+        target = event.command.get(event.command_name)
+        collection = target if isinstance(target, str) else event.command.get("collection", "")
+        if not isinstance(collection, str):
+            collection = ""
+        with self._lock:
+            self._pending[(event.request_id, event.connection_id)] = (collection, event.command_name)
+
+    def succeeded(self, event):
+        self._finish(event)
+
+    def failed(self, event):
+        labels = self._finish(event)
+        mongo_command_failures.inc(labels)
+
+    def _finish(self, event) -> Tuple[str, str]:
+        with self._lock:
+            labels = self._pending.pop((event.request_id, event.connection_id), ("", event.command_name))
+        seconds = event.duration_micros / 1_000_000
+        mongo_command_duration.observe(labels, seconds)
+        if seconds >= SLOW_COMMAND_SECONDS:
+            mongo_slow_commands.inc(labels)
+        return labels
+
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """Tracks connection pool usage per server address"""
+
+    def __init__(self):
+        self._pools: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+        # Check-out start and end are reported on the same driver thread
+        self._local = threading.local()
+
+    def _pool(self, address) -> Dict[str, int]:
+        key = "%s:%s" % address
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = self._pools[key] = {
+                "open": 0, "checked_out": 0, "checkouts": 0,
+                "checkout_timeouts": 0, "checkout_errors": 0, "cleared": 0
+            }
+        return pool
+
+    def _update(self, address, **deltas):
+        with self._lock:
+            pool = self._pool(address)
+            for name, delta in deltas.items():
+                pool[name] += delta
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {address: dict(pool) for address, pool in self._pools.items()}
+
+    def pool_created(self, event):
+        self._update(event.address)
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self._update(event.address, cleared=1)
+
+    def pool_closed(self, event):
+        with self._lock:
+            self._pools.pop("%s:%s" % event.address, None)
+
+    def connection_created(self, event):
+        self._update(event.address, open=1)
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._update(event.address, open=-1)
+
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+
+    def connection_check_out_failed(self, event):
+        if event.reason == monitoring.ConnectionCheckOutFailedReason.TIMEOUT:
+            self._update(event.address, checkout_timeouts=1)
+        else:
+            self._update(event.address, checkout_errors=1)
+
+    def connection_checked_out(self, event):
+        self._update(event.address, checked_out=1, checkouts=1)
+        started = getattr(self._local, "started", None)
+        if started is not None:
+            mongo_pool_checkout_wait.observe(("%s:%s" % event.address,), time.perf_counter() - started)
+            self._local.started = None
+
+    def connection_checked_in(self, event):
+        self._update(event.address, checked_out=-1)
+
+class RequestTimingMiddleware:
+    """ASGI middleware recording request latency under the matched route template"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            http_request_duration.observe(
+                (scope["method"], route.path if route is not None else "unmatched", str(status)),
+                time.perf_counter() - started
+            )
+
+# Shared listeners registered on the Motor client
+command_listener = MongoCommandListener()
+pool_listener = PoolStatsListener()
+
+def collect_pool_stats():
+    pools = pool_listener.stats()
+    for name, documentation in (
+        ("open", "Open pooled MongoDB connections"),
+        ("checked_out", "MongoDB connections currently checked out"),
+    ):
+        yield (f"mongo_pool_{name}_connections", "gauge", documentation,
+               [({"address": address}, pool[name]) for address, pool in pools.items()])
+    for name, documentation in (
+        ("checkouts", "Successful MongoDB connection check-outs"),
+        ("checkout_timeouts", "MongoDB connection check-outs that timed out waiting for the pool"),
+        ("checkout_errors", "MongoDB connection check-outs that failed to connect"),
+        ("cleared", "Times a MongoDB connection pool was cleared"),
+    ):
+        yield (f"mongo_pool_{name}_total", "counter", documentation,
+               [({"address": address}, pool[name]) for address, pool in pools.items()])
+
+register_collector(collect_pool_stats)
@@ -11,6 +11,14 @@ class BlogCategory(str, Enum):
     FRONTEND = "Frontend"
     GENERAL = "General"
 
+class SearchMode(str, Enum):
+    TEXT = "text"
+    SUBSTRING = "substring"
+
+class BlogView(str, Enum):
+    FULL = "full"
+    SUMMARY = "summary"
+
 class BlogCreate(BaseModel):
     title: str = Field(..., min_length=1, max_length=200)
     excerpt: str = Field(..., min_length=1, max_length=500)
@@ -27,6 +35,11 @@ class BlogCreate(BaseModel):
             raise ValueError('Maximum 10 tags allowed')
         return v
 
+class TocEntry(BaseModel):
+    level: int
+    text: str
+    anchor: str
+
 class BlogResponse(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     title: str
@@ -39,8 +52,14 @@ class BlogResponse(BaseModel):
     image: Optional[str]
     read_time: Optional[str]
     published: bool
+    # Derived from content when it is written
+    word_count: Optional[int] = None
+    content_hash: Optional[str] = None
+    content_html: Optional[str] = None
+    toc: List[TocEntry] = Field(default_factory=list)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
+    score: Optional[float] = None
 
 class BlogUpdate(BaseModel):
     title: Optional[str] = None
@@ -53,14 +72,81 @@ class BlogUpdate(BaseModel):
     published: Optional[bool] = None
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
+class BlogListItem(BaseModel):
+    """Blog post for full list pages: its content, but not the HTML and contents rendered from it"""
+    id: str
+    title: str
+    slug: str
+    excerpt: str
+    content: str
+    author: str = "Amit"
+    category: BlogCategory
+    tags: List[str]
+    image: Optional[str]
+    read_time: Optional[str]
+    published: bool
+    word_count: Optional[int] = None
+    created_at: datetime
+    updated_at: datetime
+    score: Optional[float] = None
+
+class BlogSummary(BaseModel):
+    """Blog post without its content, for list pages"""
+    id: str
+    title: str
+    slug: str
+    excerpt: str
+    author: str = "Amit"
+    category: BlogCategory
+    tags: List[str]
+    image: Optional[str]
+    read_time: Optional[str]
+    published: bool
+    word_count: Optional[int] = None
+    created_at: datetime
+    updated_at: datetime
+    score: Optional[float] = None
+
 class BlogList(BaseModel):
-    posts: List[BlogResponse]
-    total: int
+    posts: List[BlogListItem]
+    total: Optional[int]
     page: int
     per_page: int
+    has_next: bool = False
+    next_cursor: Optional[str] = None
+
+class BlogSummaryList(BaseModel):
+    posts: List[BlogSummary]
+    total: Optional[int]
+    page: int
+    per_page: int
+    has_next: bool = False
+    next_cursor: Optional[str] = None
+
+# Path segments the blog routes use next to /blog/{slug}; a post titled
+# "Facets" would otherwise be shadowed by GET /api/blog/facets
+RESERVED_SLUGS = frozenset({"export", "suggest", "facets", "category"})
 
 def create_slug(title: str) -> str:
     """Create URL-friendly slug from title"""
     slug = re.sub(r'[^\w\s-]', '', title.lower())
-    slug = re.sub(r'[-\s]+', '-', slug)
-    return slug.strip('-')
\ No newline at end of file
+    slug = re.sub(r'[-\s]+', '-', slug).strip('-')
+    if slug in RESERVED_SLUGS:
+        slug = f"{slug}-post"
+    return slug
+
+def slug_candidates(slug: str, attempts: int = 5):
+    """Slugs to try in turn when the preferred one is already taken"""
+    yield slug
+    stamp = int(datetime.utcnow().timestamp())
+    yield f"{slug}-{stamp}"
+    for attempt in range(2, attempts):
+        yield f"{slug}-{stamp}-{attempt}"
+
+def text_search_terms(search: str, max_terms: int = 32) -> str:
+    """Reduce free-form search input to plain terms for a $text query.
+
+    Quotes and leading dashes would otherwise turn into phrase and negation
+    operators, so only word characters are kept.
+    """
+    return " ".join(re.findall(r'\w+', search)[:max_terms])
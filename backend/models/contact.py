@@ -31,6 +31,18 @@ class ContactUpdate(BaseModel):
 
 class ContactList(BaseModel):
     contacts: List[ContactResponse]
-    total: int
+    total: Optional[int]
     page: int
-    per_page: int
\ No newline at end of file
+    per_page: int
+    has_next: bool = False
+    next_cursor: Optional[str] = None
+
+class ContactBulkFilter(BaseModel):
+    status: Optional[ContactStatus] = None
+    created_before: Optional[datetime] = None
+    created_after: Optional[datetime] = None
+
+class ContactBulkStatusUpdate(ContactUpdate):
+    status: ContactStatus
+    ids: Optional[List[str]] = None
+    filter: Optional[ContactBulkFilter] = None
\ No newline at end of file
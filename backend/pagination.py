@@ -0,0 +1,125 @@
+import asyncio
+import base64
+import json
+from datetime import datetime
+from enum import Enum
+from typing import List, NamedTuple, Optional, Tuple
+
+# Listings are ordered newest first, with the document id as a tie-breaker so
+# that every position in the ordering is unique and can be seeked to directly.
+SORT_ORDER = [("created_at", -1), ("id", -1)]
+
+class CountMode(str, Enum):
+    EXACT = "exact"
+    FACET = "facet"
+    ESTIMATED = "estimated"
+    NONE = "none"
+
+class Page(NamedTuple):
+    items: List[dict]
+    total: Optional[int]
+    has_next: bool
+    next_cursor: Optional[str]
+
+def encode_cursor(doc: dict) -> str:
+    """Build an opaque cursor pointing just after the given document"""
+    payload = json.dumps(
+        {"t": doc["created_at"].isoformat(), "i": doc["id"]},
+        separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Decode a cursor produced by encode_cursor, raising ValueError if it is malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["t"]), str(payload["i"])
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+def apply_cursor(query: dict, cursor: Optional[str]) -> dict:
+    """Restrict a query to the documents that follow the cursor in SORT_ORDER"""
+    if not cursor:
+        return query
+
+    created_at, doc_id = decode_cursor(cursor)
+    seek = {
+        "$or": [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "id": {"$lt": doc_id}}
+        ]
+    }
+    return {"$and": [query, seek]} if query else seek
+
+def split_page(docs: list, per_page: int) -> Tuple[list, Optional[str]]:
+    """Trim a per_page + 1 lookahead fetch and derive the next cursor from it"""
+    if len(docs) > per_page:
+        docs = docs[:per_page]
+        return docs, encode_cursor(docs[-1])
+    return docs, None
+
+def facet_pipeline(query: dict, sort: list, skip: int, limit: int, projection: Optional[dict] = None) -> list:
+    """Aggregation returning one page and the total of a query in a single document"""
+    pipeline = [{"$match": query}, {"$sort": dict(sort)}]
+    if "$text" in query:
+        pipeline.append({"$addFields": {"score": {"$meta": "textScore"}}})
+    items = [{"$skip": skip}, {"$limit": limit}]
+    if projection:
+        items.append({"$project": projection})
+    pipeline.append({"$facet": {"items": items, "total": [{"$count": "count"}]}})
+    return pipeline
+
+async def fetch_page(
+    collection,
+    query: dict,
+    sort: list,
+    skip: int,
+    per_page: int,
+    cursor: Optional[str] = None,
+    count: CountMode = CountMode.EXACT,
+    projection: Optional[dict] = None
+) -> Page:
+    """Fetch one page of documents and, depending on count, the total.
+
+    exact runs the page query and count_documents concurrently, so the
+    page stops at its limit and the count can be answered from an index.
+    facet returns both from one $facet aggregation in a single round trip,
+    but every matching document passes through the facet, so it only pays
+    off on small result sets; behind a cursor it falls back to exact.
+    estimated uses the collection metadata count when the query is
+    unfiltered; a filtered query has no cheap estimate and is counted
+    exactly. none skips counting and only reports whether another page
+    follows.
+
+    Raises ValueError if the cursor is malformed.
+    """
+    page_query = apply_cursor(query, cursor)
+    limit = per_page + 1
+    if count == CountMode.ESTIMATED and query:
+        count = CountMode.EXACT
+
+    if count == CountMode.FACET and cursor:
+        count = CountMode.EXACT
+
+    if count == CountMode.FACET:
+        pipeline = facet_pipeline(query, sort, skip, limit, projection)
+        result = (await collection.aggregate(pipeline).to_list(length=1))[0]
+        docs = result["items"]
+        total = result["total"][0]["count"] if result["total"] else 0
+    else:
+        find_projection = dict(projection) if projection else None
+        if "$text" in query:
+            find_projection = {**(find_projection or {}), "score": {"$meta": "textScore"}}
+        docs_future = collection.find(page_query, find_projection).sort(sort).skip(skip).limit(limit).to_list(length=limit)
+
+        if count == CountMode.EXACT:
+            docs, total = await asyncio.gather(docs_future, collection.count_documents(query))
+        elif count == CountMode.ESTIMATED:
+            docs, total = await asyncio.gather(docs_future, collection.estimated_document_count())
+        else:
+            docs, total = await docs_future, None
+
+    has_next = len(docs) > per_page
+    docs, next_cursor = split_page(docs, per_page)
+    return Page(items=docs, total=total, has_next=has_next, next_cursor=next_cursor)
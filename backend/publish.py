@@ -0,0 +1,244 @@
+import asyncio
+import logging
+import os
+import re
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional
+
+from dotenv import load_dotenv
+from fastapi import BackgroundTasks, Request
+from fastapi.responses import FileResponse
+
+from compression import ENCODINGS, MIN_SAVING, SUFFIXES, compress, negotiate, worth_compressing
+from conditional import make_etag, is_not_modified, not_modified, set_validators
+from models.blog import BlogCategory, BlogList, BlogListItem, BlogResponse
+from pagination import SORT_ORDER, encode_cursor
+from serialization import TrustedJSONResponse, trusted
+
+# Load environment variables
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+logger = logging.getLogger(__name__)
+
+# Listing pages carry the same fields as GET /api/blog
+LIST_PROJECTION = {"_id": 0, **{name: 1 for name in BlogListItem.model_fields}}
+
+# Only names this API generates are looked up on disk
+SAFE_NAME = re.compile(r'^[\w-]+$')
+
+def _write(path: Path, data: bytes):
+    """Replace a file atomically so readers never see a partial body"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # A temp file per write, so concurrent writers of one path never share one
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+def _variant_path(path: Path, encoding: str) -> Path:
+    return path.with_name(path.name + SUFFIXES[encoding])
+
+def _unlink(path: Path):
+    # The plain file goes first: it is what lookups check for
+    for candidate in (path, *(_variant_path(path, encoding) for encoding in SUFFIXES)):
+        try:
+            candidate.unlink()
+        except FileNotFoundError:
+            pass
+
+class BlogSnapshots:
+    """Pre-rendered JSON files for the public blog reads.
+
+    Each published post and the first pages of every listing are written as
+    the exact bytes the dynamic routes would send, plus brotli and gzip
+    variants compressed at their highest levels, and
+    served from disk. Writes delete the affected files straight away so reads
+    fall back to the database, then regenerate them in the background.
+    """
+
+    def __init__(self, directory: Optional[str], pages: int = 10, per_page: int = 10):
+        self.directory = Path(directory) if directory else None
+        self.pages = pages
+        self.per_page = per_page
+        self._lock = asyncio.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.directory is not None
+
+    def post_path(self, slug: str) -> Optional[Path]:
+        if not self.enabled or not SAFE_NAME.match(slug):
+            return None
+        return self.directory / "posts" / f"{slug}.json"
+
+    def list_path(self, category: Optional[str], page: int) -> Optional[Path]:
+        if not self.enabled or page > self.pages:
+            return None
+        return self.directory / "lists" / (category or "all") / f"page-{page}.json"
+
+    def _id_path(self, post_id: str) -> Path:
+        return self.directory / "ids" / post_id
+
+    def serves_listing(self, per_page: int, cursor=None, search=None, published_only=True, count="exact", view="full") -> bool:
+        """Whether a listing request has the shape the snapshots were rendered for"""
+        return (
+            self.enabled and per_page == self.per_page and not cursor and not search
+            and published_only and getattr(count, "value", count) in ("exact", "facet")
+            and getattr(view, "value", view) == "full"
+        )
+
+    def response(self, request: Request, path: Optional[Path]):
+        """Serve a snapshot file, or None when there is none"""
+        if path is None:
+            return None
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+
+        headers = {"Vary": "Accept-Encoding"}
+        accept_encoding = request.headers.get("accept-encoding")
+        available = [encoding for encoding in ENCODINGS if _variant_path(path, encoding).exists()]
+        encoding = negotiate(accept_encoding, available)
+        if encoding:
+            compressed = _variant_path(path, encoding)
+            try:
+                stat = os.stat(compressed)
+                path = compressed
+                headers["Content-Encoding"] = encoding
+            except FileNotFoundError:
+                pass
+
+        etag = make_etag("file", path.name, stat.st_mtime_ns, stat.st_size)
+        last_modified = datetime.utcfromtimestamp(stat.st_mtime)
+        if is_not_modified(request, etag, last_modified):
+            response = not_modified(etag, last_modified)
+            response.headers["Vary"] = "Accept-Encoding"
+            return response
+        response = FileResponse(path, media_type="application/json", headers=headers, stat_result=stat)
+        set_validators(response, etag, last_modified)
+        return response
+
+    def _store(self, path: Path, body: bytes):
+        for encoding in SUFFIXES:
+            variant = _variant_path(path, encoding)
+            compressed = compress(body, encoding, best=True) if encoding in ENCODINGS and worth_compressing(body) else None
+            if compressed is not None and len(compressed) <= len(body) * (1 - MIN_SAVING):
+                _write(variant, compressed)
+            else:
+                try:
+                    variant.unlink()
+                except FileNotFoundError:
+                    pass
+        _write(path, body)
+
+    def _forget_post(self, post_id: str):
+        if not SAFE_NAME.match(post_id):
+            return
+        try:
+            slug = self._id_path(post_id).read_text()
+        except FileNotFoundError:
+            return
+        if SAFE_NAME.match(slug):
+            _unlink(self.post_path(slug))
+
+    async def _render_post(self, db, post_id: str):
+        post = await db.blog_posts.find_one({"id": post_id}, {"_id": 0})
+        await asyncio.to_thread(self._forget_post, post_id)
+        if not post or not post.get("published") or not SAFE_NAME.match(post["slug"]):
+            await asyncio.to_thread(_unlink, self._id_path(post_id))
+            return
+        body = TrustedJSONResponse(trusted(BlogResponse, post)).body
+        await asyncio.to_thread(self._store, self.post_path(post["slug"]), body)
+        await asyncio.to_thread(_write, self._id_path(post_id), post["slug"].encode())
+
+    async def _render_listing(self, db, category: Optional[str]):
+        query = {"published": True}
+        if category:
+            query["category"] = category
+        limit = self.pages * self.per_page + 1
+        posts, total = await asyncio.gather(
+            db.blog_posts.find(query, LIST_PROJECTION).sort(SORT_ORDER).limit(limit).to_list(length=limit),
+            db.blog_posts.count_documents(query)
+        )
+
+        def write_pages():
+            page_count = max(1, min(self.pages, -(-len(posts) // self.per_page)))
+            for page in range(1, page_count + 1):
+                items = posts[(page - 1) * self.per_page:page * self.per_page]
+                has_next = len(posts) > page * self.per_page
+                body = TrustedJSONResponse(BlogList.model_construct(
+                    posts=[trusted(BlogListItem, post) for post in items],
+                    total=total,
+                    page=page,
+                    per_page=self.per_page,
+                    has_next=has_next,
+                    next_cursor=encode_cursor(items[-1]) if has_next else None
+                )).body
+                self._store(self.list_path(category, page), body)
+            for page in range(page_count + 1, self.pages + 1):
+                _unlink(self.list_path(category, page))
+
+        await asyncio.to_thread(write_pages)
+
+    def invalidate(self, post_ids: Iterable[str] = (), categories: Iterable[Optional[str]] = ()):
+        """Delete the files a write makes stale; the "all" listing is always included"""
+        if not self.enabled:
+            return
+        for post_id in post_ids:
+            self._forget_post(post_id)
+        for category in {None, *categories}:
+            for page in range(1, self.pages + 1):
+                _unlink(self.list_path(category, page))
+
+    async def regenerate(self, db, post_ids: Iterable[str] = (), categories: Iterable[Optional[str]] = ()):
+        """Render the given posts and listings again from the database"""
+        async with self._lock:
+            for post_id in post_ids:
+                await self._render_post(db, post_id)
+            for category in {None, *categories}:
+                await self._render_listing(db, category)
+
+    def changed(self, db, background_tasks: BackgroundTasks, post_ids: Iterable[str] = (), categories: Iterable = ()):
+        """Drop the files affected by a blog write now and rebuild them once the response is sent"""
+        if not self.enabled:
+            return
+        post_ids = list(post_ids)
+        categories = [getattr(category, "value", category) for category in categories if category]
+        self.invalidate(post_ids, categories)
+        background_tasks.add_task(self._regenerate_logged, db, post_ids, categories)
+
+    async def _regenerate_logged(self, db, post_ids, categories):
+        try:
+            await self.regenerate(db, post_ids, categories)
+        except Exception as e:
+            logger.error(f"Failed to regenerate blog snapshots: {str(e)}")
+
+    async def publish_all(self, db) -> dict:
+        """Render every published post and every listing, removing files for posts that are gone"""
+        post_ids = [post["id"] async for post in db.blog_posts.find({"published": True}, {"_id": 0, "id": 1})]
+        ids_dir = self.directory / "ids"
+        published = set(post_ids)
+        stale = [
+            path.name for path in ids_dir.iterdir()
+            if SAFE_NAME.match(path.name) and path.name not in published
+        ] if ids_dir.exists() else []
+        await self.regenerate(db, post_ids + stale, [category.value for category in BlogCategory])
+        return {"posts": len(post_ids), "removed": len(stale), "listings": len(BlogCategory) + 1}
+
+blog_snapshots = BlogSnapshots(
+    os.environ.get('BLOG_SNAPSHOT_DIR') or None,
+    pages=int(os.environ.get('BLOG_SNAPSHOT_PAGES', '10')),
+    per_page=int(os.environ.get('BLOG_SNAPSHOT_PER_PAGE', '10'))
+)
@@ -0,0 +1,362 @@
+import asyncio
+import logging
+import math
+import os
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from dotenv import load_dotenv
+from fastapi import BackgroundTasks
+
+from models.blog import BlogSummary
+from serialization import trusted
+
+# Load environment variables
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+logger = logging.getLogger(__name__)
+
+# Terms kept from a full build, by document frequency; others are ignored
+RELATED_MAX_FEATURES = int(os.environ.get('RELATED_MAX_FEATURES', '1024'))
+
+# Neighbours kept per post, and so the most a lookup can return
+RELATED_NEIGHBOURS = int(os.environ.get('RELATED_NEIGHBOURS', '10'))
+
+# Share of the score given to tag overlap; the rest is text similarity
+RELATED_TAG_WEIGHT = float(os.environ.get('RELATED_TAG_WEIGHT', '0.3'))
+
+# Incremental changes, as a share of indexed posts, before the next refresh rebuilds
+RELATED_REBUILD_FRACTION = float(os.environ.get('RELATED_REBUILD_FRACTION', '0.2'))
+
+# A title counts this many times over in a post's text
+TITLE_WEIGHT = 3
+
+# Rows scored per matrix product during a full build
+BUILD_BLOCK_ROWS = 512
+
+TOKEN = re.compile(r'[a-z0-9]{2,}')
+STOP_WORDS = frozenset(
+    "about an and are as at be but by can for from has have how in into is it its of on or "
+    "that the their this to was we what when which will with you your".split()
+)
+
+SUMMARY_FIELDS = [name for name in BlogSummary.model_fields if name != "score"]
+PROJECTION = {"_id": 0, "content": 1, **{name: 1 for name in SUMMARY_FIELDS}}
+
+def tokenize(text: str) -> List[str]:
+    return [term for term in TOKEN.findall(text.lower()) if term not in STOP_WORDS]
+
+def post_terms(post: dict) -> Counter:
+    """Term counts over a post's title, excerpt and content"""
+    terms = Counter(tokenize(post.get("excerpt") or "") + tokenize(post.get("content") or ""))
+    for term in tokenize(post.get("title") or ""):
+        terms[term] += TITLE_WEIGHT
+    return terms
+
+def post_tags(post: dict) -> set:
+    return {tag.strip().lower() for tag in post.get("tags") or () if tag.strip()}
+
+def _grow(array: np.ndarray, rows: int) -> np.ndarray:
+    """Return array with room for at least rows rows, doubling its capacity"""
+    if rows <= array.shape[0]:
+        return array
+    grown = np.zeros((max(rows, array.shape[0] * 2, 16), *array.shape[1:]), dtype=array.dtype)
+    grown[:array.shape[0]] = array
+    return grown
+
+class RelatedState:
+    """TF-IDF vectors, tag sets and the top neighbours of every published post.
+
+    Vectors are L2-normalised so a dot product is the cosine similarity.
+    Rows are packed: removing a post moves the last row into its slot.
+    """
+
+    def __init__(self, posts: List[dict], max_features: int, neighbours: int, tag_weight: float):
+        self.k = neighbours
+        self.tag_weight = tag_weight
+        terms = [post_terms(post) for post in posts]
+
+        document_frequency = Counter()
+        for counts in terms:
+            document_frequency.update(counts.keys())
+        vocabulary = sorted(document_frequency, key=lambda term: (-document_frequency[term], term))[:max_features]
+        self.vocab: Dict[str, int] = {term: col for col, term in enumerate(vocabulary)}
+        n = len(posts)
+        self.idf = np.array(
+            [math.log((1 + n) / (1 + document_frequency[term])) + 1 for term in vocabulary], dtype=np.float32
+        )
+
+        self.ids: List[str] = []
+        self.rows: Dict[str, int] = {}
+        self.by_slug: Dict[str, str] = {}
+        self.summaries: Dict[str, BlogSummary] = {}
+        self.vectors = np.zeros((0, len(vocabulary)), dtype=np.float32)
+        # Tags stay sparse: each row's tag set, and the rows carrying each tag
+        self.row_tags: List[frozenset] = []
+        self.postings: Dict[str, Set[int]] = {}
+        self._posting_rows: Dict[str, np.ndarray] = {}
+        self.tag_sizes = np.zeros(0, dtype=np.float32)
+        self.neighbours: Dict[str, List[Tuple[float, str]]] = {}
+
+        for post, counts in zip(posts, terms):
+            self._place(post, counts)
+
+        # Score every pair a block of rows at a time
+        for start in range(0, len(self.ids), BUILD_BLOCK_ROWS):
+            rows = range(start, min(start + BUILD_BLOCK_ROWS, len(self.ids)))
+            block = self._scores(rows)
+            for offset, row in enumerate(rows):
+                self.neighbours[self.ids[row]] = self._top(block[offset], row)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _vectorize(self, counts: Counter) -> np.ndarray:
+        vector = np.zeros(len(self.vocab), dtype=np.float32)
+        for term, count in counts.items():
+            col = self.vocab.get(term)
+            if col is not None:
+                vector[col] = (1 + math.log(count)) * self.idf[col]
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _place(self, post: dict, counts: Optional[Counter] = None) -> int:
+        """Write a post's vector, tags and summary into its row, adding one if new"""
+        post_id = post["id"]
+        row = self.rows.get(post_id)
+        if row is None:
+            row = len(self.ids)
+            self.ids.append(post_id)
+            self.rows[post_id] = row
+            self.vectors = _grow(self.vectors, row + 1)
+            self.row_tags.append(frozenset())
+            self.tag_sizes = _grow(self.tag_sizes, row + 1)
+        else:
+            previous = self.summaries[post_id].slug
+            if self.by_slug.get(previous) == post_id:
+                del self.by_slug[previous]
+
+        self.vectors[row] = self._vectorize(post_terms(post) if counts is None else counts)
+        tags = frozenset(post_tags(post))
+        for tag in self.row_tags[row] - tags:
+            self._unpost(tag, row)
+        for tag in tags - self.row_tags[row]:
+            self._post(tag, row)
+        self.row_tags[row] = tags
+        self.tag_sizes[row] = len(tags)
+
+        self.summaries[post_id] = trusted(BlogSummary, {name: post[name] for name in SUMMARY_FIELDS if name in post})
+        self.by_slug[post["slug"]] = post_id
+        return row
+
+    def _post(self, tag: str, row: int):
+        self.postings.setdefault(tag, set()).add(row)
+        self._posting_rows.pop(tag, None)
+
+    def _unpost(self, tag: str, row: int):
+        rows = self.postings[tag]
+        rows.discard(row)
+        if not rows:
+            del self.postings[tag]
+        self._posting_rows.pop(tag, None)
+
+    def _tag_rows(self, tag: str) -> np.ndarray:
+        rows = self._posting_rows.get(tag)
+        if rows is None:
+            rows = self._posting_rows[tag] = np.fromiter(self.postings[tag], dtype=np.int64)
+        return rows
+
+    def _overlap(self, rows: List[int]) -> np.ndarray:
+        """Shared tag counts between the given rows and every indexed post"""
+        overlap = np.zeros((len(rows), len(self.ids)), dtype=np.float32)
+        for offset, row in enumerate(rows):
+            for tag in self.row_tags[row]:
+                overlap[offset, self._tag_rows(tag)] += 1
+        return overlap
+
+    def _scores(self, rows) -> np.ndarray:
+        """Similarity of the given rows to every indexed post, one row of scores each"""
+        n = len(self.ids)
+        rows = list(rows)
+        text = self.vectors[rows] @ self.vectors[:n].T
+        overlap = self._overlap(rows)
+        union = self.tag_sizes[rows, None] + self.tag_sizes[None, :n] - overlap
+        jaccard = np.divide(overlap, union, out=np.zeros_like(overlap), where=union > 0)
+        return (1 - self.tag_weight) * text + self.tag_weight * jaccard
+
+    def _top(self, scores: np.ndarray, row: int) -> List[Tuple[float, str]]:
+        scores = scores.copy()
+        scores[row] = -np.inf
+        k = min(self.k, len(scores) - 1)
+        if k <= 0:
+            return []
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best], kind="stable")]
+        return [(float(scores[col]), self.ids[col]) for col in best if scores[col] > 0]
+
+    def _rescore(self, post_id: str):
+        row = self.rows[post_id]
+        self.neighbours[post_id] = self._top(self._scores([row])[0], row)
+
+    def _listed_by(self, post_id: str) -> List[str]:
+        return [
+            other for other, neighbours in self.neighbours.items()
+            if other != post_id and any(neighbour == post_id for _, neighbour in neighbours)
+        ]
+
+    def upsert(self, post: dict):
+        """Index a new or changed post and fix up the neighbour lists it enters or leaves"""
+        post_id = post["id"]
+        stale = set(self._listed_by(post_id))
+        row = self._place(post)
+        scores = self._scores([row])[0]
+        self.neighbours[post_id] = self._top(scores, row)
+
+        for other, neighbours in self.neighbours.items():
+            if other == post_id:
+                continue
+            if other in stale:
+                # Its score for this post changed, possibly downwards
+                self._rescore(other)
+                continue
+            score = float(scores[self.rows[other]])
+            if score > 0 and (len(neighbours) < self.k or score > neighbours[-1][0]):
+                neighbours.append((score, post_id))
+                neighbours.sort(key=lambda neighbour: -neighbour[0])
+                del neighbours[self.k:]
+
+    def remove(self, post_id: str):
+        """Drop a post and rescore the posts that listed it"""
+        row = self.rows.pop(post_id, None)
+        if row is None:
+            return
+        last = len(self.ids) - 1
+        for tag in self.row_tags[row]:
+            self._unpost(tag, row)
+        if row != last:
+            moved = self.ids[last]
+            self.ids[row] = moved
+            self.rows[moved] = row
+            self.vectors[row] = self.vectors[last]
+            for tag in self.row_tags[last]:
+                self._unpost(tag, last)
+                self._post(tag, row)
+            self.row_tags[row] = self.row_tags[last]
+            self.tag_sizes[row] = self.tag_sizes[last]
+        self.ids.pop()
+        self.row_tags.pop()
+        self.vectors[last] = 0
+        self.tag_sizes[last] = 0
+
+        summary = self.summaries.pop(post_id)
+        if self.by_slug.get(summary.slug) == post_id:
+            del self.by_slug[summary.slug]
+        del self.neighbours[post_id]
+        for other in self._listed_by(post_id):
+            self._rescore(other)
+
+    def related(self, slug: str, limit: int) -> Optional[List[BlogSummary]]:
+        post_id = self.by_slug.get(slug)
+        if post_id is None:
+            return None
+        return [
+            self.summaries[neighbour].model_copy(update={"score": round(score, 4)})
+            for score, neighbour in self.neighbours[post_id][:limit]
+        ]
+
+class RelatedIndex:
+    """In-memory related-posts index over published posts.
+
+    A full build vectorises every post and keeps each one's top neighbours,
+    so a lookup reads one precomputed list. Writes update only the changed
+    post and the neighbour lists it enters or leaves, reusing the vocabulary
+    and IDF weights of the last build; after enough changes the next refresh
+    rebuilds from scratch so new terms are picked up.
+    """
+
+    def __init__(self, max_features: int = 1024, neighbours: int = 10, tag_weight: float = 0.3,
+                 rebuild_fraction: float = 0.2):
+        self.max_features = max_features
+        self.neighbours = neighbours
+        self.tag_weight = tag_weight
+        self.rebuild_fraction = rebuild_fraction
+        self.current: Optional[RelatedState] = None
+        self.changes = 0
+        self._lock = asyncio.Lock()
+
+    async def build(self, db) -> RelatedState:
+        """Vectorise every published post and swap in the new index"""
+        async with self._lock:
+            return await self._build(db)
+
+    async def _build(self, db) -> RelatedState:
+        posts = await db.blog_posts.find({"published": True}, PROJECTION).to_list(length=None)
+        state = await asyncio.to_thread(
+            RelatedState, posts, self.max_features, self.neighbours, self.tag_weight
+        )
+        self.current = state
+        self.changes = 0
+        logger.info(f"Related-posts index built over {len(state)} posts")
+        return state
+
+    async def get(self, db) -> RelatedState:
+        """Return the current index, building it on first use"""
+        state = self.current
+        if state is None:
+            async with self._lock:
+                # A build may have finished while this request waited
+                state = self.current or await self._build(db)
+        return state
+
+    async def refresh(self, db, post_ids: Iterable[str]):
+        """Apply writes to the given posts, or rebuild once incremental drift is large"""
+        post_ids = list(post_ids)
+        async with self._lock:
+            state = self.current
+            if state is None:
+                return
+            if self.changes + len(post_ids) > max(self.neighbours, len(state) * self.rebuild_fraction):
+                await self._build(db)
+                return
+            posts = await db.blog_posts.find({"id": {"$in": post_ids}}, PROJECTION).to_list(length=None)
+            found = {post["id"]: post for post in posts}
+            for post_id in post_ids:
+                post = found.get(post_id)
+                if post and post.get("published"):
+                    state.upsert(post)
+                else:
+                    state.remove(post_id)
+            self.changes += len(post_ids)
+
+    def changed(self, db, background_tasks: BackgroundTasks, post_ids: Iterable[str]):
+        """Update the index for written posts once the response is sent"""
+        # A build in progress may have read the posts before this write
+        if self.current is None and not self._lock.locked():
+            return
+        background_tasks.add_task(self._refresh_logged, db, list(post_ids))
+
+    async def _refresh_logged(self, db, post_ids):
+        try:
+            await self.refresh(db, post_ids)
+        except Exception as e:
+            logger.error(f"Failed to refresh related-posts index: {str(e)}")
+
+    def stats(self) -> dict:
+        state = self.current
+        return {
+            "posts": len(state) if state else 0,
+            "features": len(state.vocab) if state else 0,
+            "tags": len(state.postings) if state else 0,
+            "changes_since_build": self.changes
+        }
+
+related_index = RelatedIndex(
+    max_features=RELATED_MAX_FEATURES,
+    neighbours=RELATED_NEIGHBOURS,
+    tag_weight=RELATED_TAG_WEIGHT,
+    rebuild_fraction=RELATED_REBUILD_FRACTION
+)
@@ -0,0 +1,163 @@
+import hashlib
+import html
+import math
+import re
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from pymongo import UpdateOne
+
+# Average adult silent reading speed used for read_time
+WORDS_PER_MINUTE = 200
+
+HEADING = re.compile(r'^(#{1,6})\s+(.+?)\s*#*\s*$')
+BULLET = re.compile(r'^\s*[-*]\s+(.*)$')
+NUMBERED = re.compile(r'^\s*\d+[.)]\s+(.*)$')
+FENCE = re.compile(r'^\s*```')
+
+def content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode()).hexdigest()
+
+def count_words(content: str) -> int:
+    return len(re.findall(r'\w+', content))
+
+def reading_time(word_count: int) -> str:
+    return f"{max(1, math.ceil(word_count / WORDS_PER_MINUTE))} min read"
+
+def _anchor(text: str, used: Dict[str, int]) -> str:
+    anchor = re.sub(r'[^\w\s-]', '', text.lower())
+    anchor = re.sub(r'[-\s]+', '-', anchor).strip('-') or "section"
+    count = used.get(anchor, 0)
+    used[anchor] = count + 1
+    return anchor if count == 0 else f"{anchor}-{count}"
+
+def _inline(text: str) -> str:
+    text = html.escape(text)
+    text = re.sub(r'`([^`]+)`', r'<code>\1</code>', text)
+    text = re.sub(r'\*\*([^*]+)\*\*', r'<strong>\1</strong>', text)
+    return re.sub(r'(?<!\*)\*([^*]+)\*(?!\*)', r'<em>\1</em>', text)
+
+def render_content(content: str) -> Tuple[str, List[dict]]:
+    """Render post content to HTML and collect its heading outline.
+
+    Content is plain text with a small Markdown subset: blank lines separate
+    paragraphs, ``#`` lines are headings, ``-``/``1.`` lines are lists and
+    ``` fences are code blocks. Everything else is escaped.
+    """
+    blocks: List[str] = []
+    toc: List[dict] = []
+    used: Dict[str, int] = {}
+    paragraph: List[str] = []
+    items: List[str] = []
+    list_tag = None
+    code: List[str] = []
+    in_code = False
+
+    def flush():
+        nonlocal list_tag
+        if paragraph:
+            blocks.append("<p>" + "<br>".join(_inline(line) for line in paragraph) + "</p>")
+            paragraph.clear()
+        if items:
+            blocks.append(f"<{list_tag}>" + "".join(f"<li>{_inline(item)}</li>" for item in items) + f"</{list_tag}>")
+            items.clear()
+            list_tag = None
+
+    for line in content.splitlines():
+        if in_code:
+            if FENCE.match(line):
+                blocks.append("<pre><code>" + html.escape("\n".join(code)) + "</code></pre>")
+                code.clear()
+                in_code = False
+            else:
+                code.append(line)
+            continue
+        if FENCE.match(line):
+            flush()
+            in_code = True
+            continue
+        if not line.strip():
+            flush()
+            continue
+
+        heading = HEADING.match(line)
+        if heading:
+            flush()
+            level, text = len(heading.group(1)), heading.group(2)
+            anchor = _anchor(text, used)
+            toc.append({"level": level, "text": text, "anchor": anchor})
+            blocks.append(f'<h{level} id="{anchor}">{_inline(text)}</h{level}>')
+            continue
+
+        for pattern, tag in ((BULLET, "ul"), (NUMBERED, "ol")):
+            item = pattern.match(line)
+            if item:
+                if paragraph or (list_tag and list_tag != tag):
+                    flush()
+                list_tag = tag
+                items.append(item.group(1))
+                break
+        else:
+            if items:
+                flush()
+            paragraph.append(line.strip())
+
+    if in_code:
+        blocks.append("<pre><code>" + html.escape("\n".join(code)) + "</code></pre>")
+    flush()
+    return "\n".join(blocks), toc
+
+def derive_fields(content: str) -> dict:
+    """Fields stored alongside a post's content so reads never recompute them"""
+    content_html, toc = render_content(content)
+    word_count = count_words(content)
+    return {
+        "content_hash": content_hash(content),
+        "word_count": word_count,
+        "read_time": reading_time(word_count),
+        "content_html": content_html,
+        "toc": toc,
+    }
+
+def read_time_typed(post: dict) -> bool:
+    """Whether a stored read_time was typed by hand rather than computed from the content.
+
+    A computed read_time matches the word_count stored with it; posts from
+    before word_count was stored only carry hand-typed ones.
+    """
+    read_time = post.get("read_time")
+    if not read_time:
+        return False
+    word_count = post.get("word_count")
+    return word_count is None or read_time != reading_time(word_count)
+
+def derive_changed_fields(post: dict, content: str) -> dict:
+    """Derived fields for a stored post's new content, keeping a hand-typed read_time"""
+    derived = derive_fields(content)
+    if read_time_typed(post):
+        derived.pop("read_time")
+    return derived
+
+async def backfill_derived_fields(db, batch_size: int = 500, force: bool = False) -> dict:
+    """Store derived fields on posts written before they existed or whose content changed.
+
+    Posts whose stored content_hash matches their content are skipped unless
+    force is set. A hand-typed read_time is kept, a computed one recomputed.
+    """
+    scanned = updated = 0
+    batch = []
+    projection = {"_id": 0, "id": 1, "content": 1, "content_hash": 1, "read_time": 1, "word_count": 1}
+    async for post in db.blog_posts.find({}, projection).batch_size(batch_size):
+        scanned += 1
+        content = post.get("content") or ""
+        if not force and post.get("content_hash") == content_hash(content):
+            continue
+        derived = derive_changed_fields(post, content)
+        derived["updated_at"] = datetime.utcnow()
+        batch.append(UpdateOne({"id": post["id"]}, {"$set": derived}))
+        if len(batch) >= batch_size:
+            updated += (await db.blog_posts.bulk_write(batch, ordered=False)).modified_count
+            batch = []
+    if batch:
+        updated += (await db.blog_posts.bulk_write(batch, ordered=False)).modified_count
+    return {"scanned": scanned, "updated": updated}
@@ -1,104 +1,442 @@
-from fastapi import APIRouter, HTTPException, Query, Depends
-from typing import List, Optional
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Query, Depends, Request
+from typing import Dict, List, Optional, Tuple, Union
 from datetime import datetime
 import logging
+import re
+from collections import Counter
+from pydantic import ValidationError
+from pymongo import InsertOne, ReturnDocument
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 
-from models.blog import BlogCreate, BlogResponse, BlogUpdate, BlogList, BlogCategory, create_slug
+from models.blog import (
+    BlogCreate, BlogResponse, BlogUpdate, BlogList, BlogListItem, BlogCategory, BlogSummary, BlogSummaryList,
+    BlogView, SearchMode, create_slug, slug_candidates, text_search_terms
+)
 from database import get_database
+from coherence import generations
+from counters import facet_deltas, increment_blog_facets, load_blog_facets, post_facets
+from pagination import SORT_ORDER, CountMode, fetch_page
+from cache import blog_cache, make_key
+from conditional import make_etag, is_not_modified, not_modified
+from compression import encoded_response
+from serialization import TrustedJSONResponse, read_ndjson, trusted
+from export import ExportFormat, export_query, stream_export
+from publish import blog_snapshots
+from related import RELATED_NEIGHBOURS, related_index
+from suggest import MAX_SUGGESTIONS, suggest_index
+from rendering import derive_changed_fields, derive_fields
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Posts validated and written per bulk_write in a bulk import
+BULK_CHUNK_SIZE = 500
+
+# Post fields the facet counters are derived from
+FACET_FIELDS = {"published", "category", "tags"}
+
+# Projections and models for each listing view; the summary view never
+# reads post content from the database, and neither view reads the HTML
+# and table of contents rendered from it
+LIST_VIEWS = {
+    BlogView.FULL: ({"_id": 0, **{name: 1 for name in BlogListItem.model_fields}}, BlogListItem, BlogList),
+    BlogView.SUMMARY: ({"_id": 0, **{name: 1 for name in BlogSummary.model_fields}}, BlogSummary, BlogSummaryList)
+}
+
+def build_list_query(
+    published_only: bool,
+    category: Optional[BlogCategory] = None,
+    search: Optional[str] = None,
+    search_mode: SearchMode = SearchMode.TEXT
+) -> Tuple[dict, list]:
+    """Filter and sort order for a blog listing, shaped to match the blog_posts indexes"""
+    query = {}
+    sort = SORT_ORDER
+    if published_only:
+        query['published'] = True
+    if category:
+        query['category'] = category.value
+    if search and search_mode == SearchMode.TEXT:
+        terms = text_search_terms(search)
+        if terms:
+            query['$text'] = {"$search": terms}
+            sort = [("score", {"$meta": "textScore"})] + SORT_ORDER
+        else:
+            # Nothing searchable was typed, so nothing can match it
+            query['id'] = {"$in": []}
+    elif search:
+        pattern = re.escape(search)
+        query['$or'] = [
+            {"title": {"$regex": pattern, "$options": "i"}},
+            {"excerpt": {"$regex": pattern, "$options": "i"}},
+            {"tags": {"$regex": pattern, "$options": "i"}}
+        ]
+    return query, sort
+
+def is_slug_conflict(details: Optional[dict], message: str = "") -> bool:
+    """Whether a duplicate key error, or one bulk write error, came from the unique slug index"""
+    key_pattern = (details or {}).get('keyPattern')
+    if key_pattern is not None:
+        return 'slug' in key_pattern
+    return 'slug' in message
+
+def list_cache_tags(category: Optional[str], posts: List[Union[BlogListItem, BlogSummary]], search: Optional[str] = None) -> List[str]:
+    """Tags for a cached listing: its filter plus every post shown on the page"""
+    tags = [f"category:{category}" if category else "list"]
+    if search:
+        tags.append("search")
+    tags.extend(f"post:{post.id}" for post in posts)
+    return tags
+
+def conditional_post(request: Request, post: BlogResponse):
+    """Answer with 304 when the client already holds this version of the post"""
+    etag = make_etag("post", post.id, post.updated_at.isoformat())
+    if is_not_modified(request, etag, post.updated_at):
+        return not_modified(etag, post.updated_at)
+    return encoded_response(request, etag, lambda: TrustedJSONResponse(post).body, post.updated_at)
+
+def conditional_list(request: Request, cache_key, blog_list: Union[BlogList, BlogSummaryList]):
+    """Answer with 304 when the client already holds this version of the listing.
+
+    Listings only carry an ETag: a deletion changes the page without moving
+    any updated_at forward, so Last-Modified could not be trusted here.
+    """
+    etag = make_etag(
+        "list", cache_key, blog_list.total, blog_list.has_next, blog_list.next_cursor,
+        *(f"{post.id}@{post.updated_at.isoformat()}" for post in blog_list.posts)
+    )
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    return encoded_response(request, etag, lambda: TrustedJSONResponse(blog_list).body)
+
+def invalidate_blog_cache(post_id: str, categories=(), membership_changed: bool = True):
+    """Drop the cached blog reads affected by a write to one post.
+
+    Pages that show the post are tagged with it. Listings that could gain or
+    lose the post, or shift by one, are only dropped when its membership in
+    them may have changed (create, delete, category or publish changes).
+    """
+    tags = [f"post:{post_id}", "search"]
+    if membership_changed:
+        tags.append("list")
+        tags.extend(f"category:{getattr(c, 'value', c)}" for c in categories if c)
+    blog_cache.invalidate(*tags)
+
+def new_post(blog_data: BlogCreate) -> BlogResponse:
+    """Build the stored form of a new post"""
+    blog_dict = blog_data.dict()
+    blog_dict['slug'] = create_slug(blog_dict['title'])
+    blog_dict['created_at'] = datetime.utcnow()
+    blog_dict['updated_at'] = datetime.utcnow()
+    # An explicitly given read_time wins over the computed one
+    read_time = blog_dict.get('read_time')
+    blog_dict.update(derive_fields(blog_dict['content']))
+    if read_time:
+        blog_dict['read_time'] = read_time
+    return BlogResponse(**blog_dict)
+
+async def insert_posts(db, posts: List[BlogResponse]) -> Dict[int, str]:
+    """Insert posts with one unordered bulk_write, retrying slug collisions.
+
+    Returns an error message for each index in posts that was not written.
+    """
+    errors = {}
+    pending = {index: slug_candidates(post.slug) for index, post in enumerate(posts)}
+    for index, candidates in pending.items():
+        posts[index].slug = next(candidates)
+
+    while pending:
+        indexes = list(pending)
+        try:
+            await db.blog_posts.bulk_write([InsertOne(posts[index].dict()) for index in indexes], ordered=False)
+            break
+        except BulkWriteError as e:
+            retry = {}
+            for write_error in e.details.get('writeErrors', []):
+                index = indexes[write_error['index']]
+                if write_error.get('code') == 11000 and is_slug_conflict(write_error, write_error.get('errmsg', '')):
+                    slug = next(pending[index], None)
+                    if slug:
+                        posts[index].slug = slug
+                        retry[index] = pending[index]
+                        continue
+                    errors[index] = "Could not find a free slug for this title"
+                else:
+                    errors[index] = write_error.get('errmsg', 'Write failed')
+            pending = retry
+    return errors
+
+def validation_messages(error: ValidationError) -> List[str]:
+    """One readable message per field that failed validation"""
+    return [f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}" for item in error.errors()]
+
 @router.post("/blog", response_model=BlogResponse)
-async def create_blog_post(blog_data: BlogCreate, db = Depends(get_database)):
+async def create_blog_post(blog_data: BlogCreate, background_tasks: BackgroundTasks, db = Depends(get_database)):
     """Create a new blog post (admin endpoint)"""
     try:
-        # Convert to dict and add metadata
-        blog_dict = blog_data.dict()
-        blog_dict['slug'] = create_slug(blog_dict['title'])
-        blog_dict['created_at'] = datetime.utcnow()
-        blog_dict['updated_at'] = datetime.utcnow()
-        
-        # Check for duplicate slug
-        existing_post = await db.blog_posts.find_one({"slug": blog_dict['slug']})
-        if existing_post:
-            # Add timestamp to make slug unique
-            blog_dict['slug'] = f"{blog_dict['slug']}-{int(datetime.utcnow().timestamp())}"
-        
         # Create blog object for response
-        blog_obj = BlogResponse(**blog_dict)
-        
-        # Insert into database
-        result = await db.blog_posts.insert_one(blog_obj.dict())
+        blog_obj = new_post(blog_data)
         
-        if result.inserted_id:
-            logger.info(f"New blog post created: {blog_obj.title}")
-            return blog_obj
+        # Insert, letting the unique slug index arbitrate concurrent creates
+        for slug in slug_candidates(blog_obj.slug):
+            blog_obj.slug = slug
+            try:
+                await db.blog_posts.insert_one(blog_obj.dict())
+                break
+            except DuplicateKeyError as e:
+                if not is_slug_conflict(e.details, str(e)):
+                    raise
         else:
-            raise HTTPException(status_code=500, detail="Failed to create blog post")
+            raise HTTPException(status_code=409, detail="Could not find a free slug for this title")
+        
+        await increment_blog_facets(db, post_facets(blog_obj.dict(include=FACET_FIELDS)))
+        invalidate_blog_cache(blog_obj.id, [blog_obj.category])
+        blog_snapshots.changed(db, background_tasks, [blog_obj.id], [blog_obj.category])
+        related_index.changed(db, background_tasks, [blog_obj.id])
+        suggest_index.changed(db, background_tasks)
+        await generations.bump(db, "blog_posts", [blog_obj.id])
+        logger.info(f"New blog post created: {blog_obj.title}")
+        return blog_obj
             
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error creating blog post: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
-@router.get("/blog", response_model=BlogList)
+@router.post("/blog/bulk")
+async def bulk_create_blog_posts(request: Request, background_tasks: BackgroundTasks, db = Depends(get_database)):
+    """Import blog posts from an NDJSON body, one BlogCreate object per line (admin endpoint).
+
+    Lines are validated and written in chunks with unordered bulk writes, so
+    one bad line does not stop the rest. Every line gets a result.
+    """
+    try:
+        results = []
+        categories = set()
+        created_ids = []
+        facets = Counter()
+
+        async def write_chunk(chunk: List[Tuple[int, BlogResponse]]):
+            posts = [post for _, post in chunk]
+            errors = await insert_posts(db, posts)
+            for index, (line_no, post) in enumerate(chunk):
+                if index in errors:
+                    results.append({"line": line_no, "status": "error", "errors": [errors[index]]})
+                else:
+                    categories.add(post.category)
+                    created_ids.append(post.id)
+                    facets.update(post_facets(post.dict(include=FACET_FIELDS)))
+                    results.append({"line": line_no, "status": "created", "id": post.id, "slug": post.slug})
+
+        chunk = []
+        async for line_no, item in read_ndjson(request.stream()):
+            if isinstance(item, ValueError):
+                results.append({"line": line_no, "status": "error", "errors": [str(item)]})
+                continue
+            try:
+                if not isinstance(item, dict):
+                    raise ValueError("Each line must be a JSON object")
+                chunk.append((line_no, new_post(BlogCreate(**item))))
+            except ValidationError as e:
+                results.append({"line": line_no, "status": "error", "errors": validation_messages(e)})
+            except ValueError as e:
+                results.append({"line": line_no, "status": "error", "errors": [str(e)]})
+            if len(chunk) >= BULK_CHUNK_SIZE:
+                await write_chunk(chunk)
+                chunk = []
+        if chunk:
+            await write_chunk(chunk)
+
+        results.sort(key=lambda result: result["line"])
+        created = sum(1 for result in results if result["status"] == "created")
+        if created:
+            await increment_blog_facets(db, facets)
+            blog_cache.invalidate("list", "search", *(f"category:{category.value}" for category in categories))
+            blog_snapshots.changed(db, background_tasks, created_ids, categories)
+            related_index.changed(db, background_tasks, created_ids)
+            suggest_index.changed(db, background_tasks)
+            await generations.bump(db, "blog_posts", created_ids)
+        logger.info(f"Bulk import: {created} blog posts created, {len(results) - created} failed")
+        return {"created": created, "failed": len(results) - created, "results": results}
+
+    except Exception as e:
+        logger.error(f"Error importing blog posts: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.get("/blog", response_model=Union[BlogList, BlogSummaryList])
 async def get_blog_posts(
+    request: Request,
     page: int = Query(1, ge=1),
     per_page: int = Query(10, ge=1, le=100),
     category: Optional[BlogCategory] = None,
     published_only: bool = Query(True),
     search: Optional[str] = None,
+    search_mode: SearchMode = Query(SearchMode.TEXT),
+    cursor: Optional[str] = None,
+    count: CountMode = Query(CountMode.EXACT),
+    view: BlogView = Query(BlogView.FULL),
     db = Depends(get_database)
 ):
-    """Get all blog posts with filtering and pagination"""
+    """Get all blog posts with filtering and pagination.
+
+    Pass the ``next_cursor`` of a previous response as ``cursor`` to seek
+    straight to the following page instead of skipping by ``page``.
+    Text searches go through the text index and are ordered by relevance,
+    so they page with ``page`` only. ``count`` trades the accuracy of
+    ``total`` for speed; with ``none`` only ``has_next`` is reported.
+    ``view=summary`` leaves out each post's content.
+    """
     try:
+        # Serve the pre-rendered file when this is one of the published pages
+        if blog_snapshots.serves_listing(
+            per_page, cursor=cursor, search=search, published_only=published_only, count=count, view=view
+        ):
+            snapshot = blog_snapshots.response(request, blog_snapshots.list_path(category.value if category else None, page))
+            if snapshot is not None:
+                return snapshot
+        
+        # Serve from cache when this exact listing was built recently
+        cache_key = make_key(
+            "blog_posts", page=page, per_page=per_page, category=category,
+            published_only=published_only, search=search.lower() if search else None,
+            search_mode=search_mode if search else None, cursor=cursor, count=count, view=view
+        )
+        cached = blog_cache.get(cache_key)
+        if cached is not None:
+            return conditional_list(request, cache_key, cached)
+        # A write landing while this page is read must not leave it cached
+        epoch = blog_cache.epoch
+        
         # Build query
-        query = {}
-        if published_only:
-            query['published'] = True
-        if category:
-            query['category'] = category.value
-        if search:
-            query['$or'] = [
-                {"title": {"$regex": search, "$options": "i"}},
-                {"excerpt": {"$regex": search, "$options": "i"}},
-                {"tags": {"$regex": search, "$options": "i"}}
-            ]
-        
-        # Calculate pagination
-        skip = (page - 1) * per_page
-        
-        # Get posts
-        posts_cursor = db.blog_posts.find(query).sort("created_at", -1).skip(skip).limit(per_page)
-        posts = await posts_cursor.to_list(length=per_page)
-        
-        # Get total count
-        total = await db.blog_posts.count_documents(query)
+        query, sort = build_list_query(published_only, category, search, search_mode)
+        if cursor and '$text' in query:
+            raise HTTPException(status_code=400, detail="Cursor pagination is not supported for text search")
+        
+        # Get posts and total count, seeking past the cursor when one is given
+        projection, post_model, list_model = LIST_VIEWS[view]
+        skip = 0 if cursor else (page - 1) * per_page
+        try:
+            result = await fetch_page(
+                db.blog_posts, query, sort, skip, per_page, cursor=cursor, count=count, projection=projection
+            )
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
         
         # Convert to response models
-        blog_responses = [BlogResponse(**post) for post in posts]
+        blog_responses = [trusted(post_model, post) for post in result.items]
         
-        return BlogList(
+        blog_list = list_model.model_construct(
             posts=blog_responses,
-            total=total,
+            total=result.total,
             page=page,
-            per_page=per_page
+            per_page=per_page,
+            has_next=result.has_next,
+            # Relevance order has no stable seek key
+            next_cursor=None if '$text' in query else result.next_cursor
         )
+        blog_cache.set(cache_key, blog_list, list_cache_tags(query.get('category'), blog_responses, search), epoch)
+        return conditional_list(request, cache_key, blog_list)
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting blog posts: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+@router.get("/blog/export")
+async def export_blog_posts(
+    format: ExportFormat = Query(ExportFormat.NDJSON),
+    category: Optional[BlogCategory] = None,
+    published_only: bool = Query(True),
+    search: Optional[str] = None,
+    since: Optional[datetime] = None,
+    db = Depends(get_database)
+):
+    """Stream blog posts as NDJSON or CSV (admin endpoint).
+
+    Takes the listing filters, with ``search`` matched as a substring. Posts
+    come in ``updated_at`` order; pass the last ``updated_at`` seen as
+    ``since`` to export only what changed after a previous run.
+    """
+    query, _ = build_list_query(published_only, category, search, SearchMode.SUBSTRING)
+    query, sort = export_query(query, since)
+    fields = [name for name in BlogResponse.model_fields if name not in ('score', 'content_html', 'toc')]
+    return stream_export(db.blog_posts, query, sort, format, fields, "blog_posts")
+
+@router.get("/blog/suggest")
+async def suggest_blog_terms(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(5, ge=1, le=MAX_SUGGESTIONS),
+    db = Depends(get_database)
+):
+    """Typeahead suggestions from published post titles, tags and categories.
+
+    Served from an in-memory prefix index, so keystrokes never reach the database.
+    """
+    try:
+        state = await suggest_index.get(db)
+        return TrustedJSONResponse({"query": q, "suggestions": state.suggest(q, limit)})
+        
+    except Exception as e:
+        logger.error(f"Error suggesting blog terms for {q!r}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.get("/blog/facets")
+async def get_blog_facets(db = Depends(get_database)):
+    """Get published post counts per category and tag, most used first.
+
+    Served from counters kept current by the write paths; run
+    ``python manage.py reconcile-blog-facets`` to rebuild them.
+    """
+    try:
+        facets = await load_blog_facets(db)
+        
+        def ranked(counts: Dict[str, int]) -> List[dict]:
+            items = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+            return [{"name": name, "count": count} for name, count in items if count > 0]
+        
+        return {
+            "total": facets["total"],
+            "categories": ranked(facets["categories"]),
+            "tags": ranked(facets["tags"])
+        }
+        
+    except Exception as e:
+        logger.error(f"Error getting blog facets: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
 @router.get("/blog/{slug}", response_model=BlogResponse)
-async def get_blog_post(slug: str, db = Depends(get_database)):
+async def get_blog_post(slug: str, request: Request, db = Depends(get_database)):
     """Get a specific blog post by slug"""
     try:
-        post = await db.blog_posts.find_one({"slug": slug})
+        snapshot = blog_snapshots.response(request, blog_snapshots.post_path(slug))
+        if snapshot is not None:
+            return snapshot
+        
+        cache_key = make_key("blog_post", slug=slug)
+        cached = blog_cache.get(cache_key)
+        if cached is not None:
+            return conditional_post(request, cached)
+        epoch = blog_cache.epoch
+        
+        # Revalidate against the post's timestamps before loading its content
+        if "if-none-match" in request.headers or "if-modified-since" in request.headers:
+            stamp = await db.blog_posts.find_one({"slug": slug}, {"_id": 0, "id": 1, "updated_at": 1})
+            if not stamp:
+                raise HTTPException(status_code=404, detail="Blog post not found")
+            etag = make_etag("post", stamp["id"], stamp["updated_at"].isoformat())
+            if is_not_modified(request, etag, stamp["updated_at"]):
+                return not_modified(etag, stamp["updated_at"])
+        
+        post = await db.blog_posts.find_one({"slug": slug}, {"_id": 0})
         
         if not post:
             raise HTTPException(status_code=404, detail="Blog post not found")
         
-        return BlogResponse(**post)
+        blog_obj = trusted(BlogResponse, post)
+        blog_cache.set(cache_key, blog_obj, [f"post:{blog_obj.id}"], epoch)
+        return conditional_post(request, blog_obj)
         
     except HTTPException:
         raise
@@ -106,41 +444,83 @@ async def get_blog_post(slug: str, db = Depends(get_database)):
         logger.error(f"Error getting blog post {slug}: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
-@router.put("/blog/{post_id}", response_model=BlogResponse)
-async def update_blog_post(post_id: str, blog_update: BlogUpdate, db = Depends(get_database)):
-    """Update a blog post (admin endpoint)"""
+@router.get("/blog/{slug}/related", response_model=List[BlogSummary])
+async def get_related_posts(
+    slug: str,
+    limit: int = Query(5, ge=1, le=RELATED_NEIGHBOURS),
+    db = Depends(get_database)
+):
+    """Get the published posts most similar to a post by text and tags, best first"""
     try:
-        # Find existing post
-        existing_post = await db.blog_posts.find_one({"id": post_id})
-        
-        if not existing_post:
+        state = await related_index.get(db)
+        related = state.related(slug, limit)
+        if related is None:
             raise HTTPException(status_code=404, detail="Blog post not found")
+        return TrustedJSONResponse(related)
         
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting posts related to {slug}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.put("/blog/{post_id}", response_model=BlogResponse)
+async def update_blog_post(post_id: str, blog_update: BlogUpdate, background_tasks: BackgroundTasks, db = Depends(get_database)):
+    """Update a blog post (admin endpoint)"""
+    try:
         # Update fields
         update_data = blog_update.dict(exclude_unset=True)
         update_data['updated_at'] = datetime.utcnow()
         
-        # Update slug if title changed
-        if 'title' in update_data:
-            new_slug = create_slug(update_data['title'])
-            # Check for duplicate slug
-            existing_slug = await db.blog_posts.find_one({"slug": new_slug, "id": {"$ne": post_id}})
-            if existing_slug:
-                new_slug = f"{new_slug}-{int(datetime.utcnow().timestamp())}"
-            update_data['slug'] = new_slug
-        
-        # Update in database
-        result = await db.blog_posts.update_one(
-            {"id": post_id},
-            {"$set": update_data}
-        )
+        # Recompute the fields derived from content when it changes; a
+        # read_time sent with the update or typed by hand earlier is kept
+        if update_data.get('content') is not None:
+            if update_data.get('read_time'):
+                derived = derive_fields(update_data['content'])
+                derived.pop('read_time')
+            else:
+                stored = await db.blog_posts.find_one({"id": post_id}, {"_id": 0, "read_time": 1, "word_count": 1})
+                derived = derive_changed_fields(stored or {}, update_data['content'])
+            update_data.update(derived)
+        
+        # Update slug if title changed, retrying while another post holds it
+        slugs = slug_candidates(create_slug(update_data['title'])) if 'title' in update_data else [None]
+        for slug in slugs:
+            if slug:
+                update_data['slug'] = slug
+            try:
+                # The pre-image tells which facets and listings the post leaves
+                previous_post = await db.blog_posts.find_one_and_update(
+                    {"id": post_id},
+                    {"$set": update_data},
+                    projection={"_id": 0},
+                    return_document=ReturnDocument.BEFORE
+                )
+                break
+            except DuplicateKeyError as e:
+                if not is_slug_conflict(e.details, str(e)):
+                    raise
+        else:
+            raise HTTPException(status_code=409, detail="Could not find a free slug for this title")
         
-        if result.modified_count == 0:
-            raise HTTPException(status_code=400, detail="No changes made")
+        if not previous_post:
+            raise HTTPException(status_code=404, detail="Blog post not found")
+        updated_post = {**previous_post, **update_data}
         
-        # Get updated post
-        updated_post = await db.blog_posts.find_one({"id": post_id})
+        await increment_blog_facets(db, facet_deltas(previous_post, updated_post))
         
+        # A category or publish change can move the post between listings
+        membership_changed = 'category' in update_data or 'published' in update_data
+        categories = [previous_post.get('category'), updated_post.get('category')]
+        invalidate_blog_cache(
+            post_id,
+            categories if membership_changed else (),
+            membership_changed=membership_changed
+        )
+        blog_snapshots.changed(db, background_tasks, [post_id], categories)
+        related_index.changed(db, background_tasks, [post_id])
+        suggest_index.changed(db, background_tasks)
+        await generations.bump(db, "blog_posts", [post_id])
         logger.info(f"Blog post {post_id} updated")
         return BlogResponse(**updated_post)
         
@@ -151,14 +531,20 @@ async def update_blog_post(post_id: str, blog_update: BlogUpdate, db = Depends(g
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.delete("/blog/{post_id}")
-async def delete_blog_post(post_id: str, db = Depends(get_database)):
+async def delete_blog_post(post_id: str, background_tasks: BackgroundTasks, db = Depends(get_database)):
     """Delete a blog post (admin endpoint)"""
     try:
-        result = await db.blog_posts.delete_one({"id": post_id})
+        deleted_post = await db.blog_posts.find_one_and_delete({"id": post_id}, {"category": 1, "tags": 1, "published": 1})
         
-        if result.deleted_count == 0:
+        if not deleted_post:
             raise HTTPException(status_code=404, detail="Blog post not found")
         
+        await increment_blog_facets(db, facet_deltas(before=deleted_post))
+        invalidate_blog_cache(post_id, [deleted_post.get('category')])
+        blog_snapshots.changed(db, background_tasks, [post_id], [deleted_post.get('category')])
+        related_index.changed(db, background_tasks, [post_id])
+        suggest_index.changed(db, background_tasks)
+        await generations.bump(db, "blog_posts", [post_id])
         logger.info(f"Blog post {post_id} deleted")
         return {"message": "Blog post deleted successfully"}
         
@@ -168,37 +554,66 @@ async def delete_blog_post(post_id: str, db = Depends(get_database)):
         logger.error(f"Error deleting blog post {post_id}: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
-@router.get("/blog/category/{category}", response_model=BlogList)
+@router.get("/blog/category/{category}", response_model=Union[BlogList, BlogSummaryList])
 async def get_posts_by_category(
+    request: Request,
     category: BlogCategory,
     page: int = Query(1, ge=1),
     per_page: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None,
+    count: CountMode = Query(CountMode.EXACT),
+    view: BlogView = Query(BlogView.FULL),
     db = Depends(get_database)
 ):
-    """Get blog posts by category"""
+    """Get blog posts by category; ``view=summary`` leaves out each post's content"""
     try:
-        query = {"category": category.value, "published": True}
+        if blog_snapshots.serves_listing(per_page, cursor=cursor, count=count, view=view):
+            snapshot = blog_snapshots.response(request, blog_snapshots.list_path(category.value, page))
+            if snapshot is not None:
+                return snapshot
         
-        # Calculate pagination
-        skip = (page - 1) * per_page
+        cache_key = make_key(
+            "posts_by_category", category=category, page=page,
+            per_page=per_page, cursor=cursor, count=count, view=view
+        )
+        cached = blog_cache.get(cache_key)
+        if cached is not None:
+            return conditional_list(request, cache_key, cached)
+        epoch = blog_cache.epoch
         
-        # Get posts
-        posts_cursor = db.blog_posts.find(query).sort("created_at", -1).skip(skip).limit(per_page)
-        posts = await posts_cursor.to_list(length=per_page)
+        query, sort = build_list_query(True, category)
         
-        # Get total count
-        total = await db.blog_posts.count_documents(query)
+        # Get posts and total count, seeking past the cursor when one is given
+        projection, post_model, list_model = LIST_VIEWS[view]
+        skip = 0 if cursor else (page - 1) * per_page
+        try:
+            result = await fetch_page(
+                db.blog_posts, query, sort, skip, per_page, cursor=cursor, count=count, projection=projection
+            )
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
         
         # Convert to response models
-        blog_responses = [BlogResponse(**post) for post in posts]
+        blog_responses = [trusted(post_model, post) for post in result.items]
         
-        return BlogList(
+        blog_list = list_model.model_construct(
             posts=blog_responses,
-            total=total,
+            total=result.total,
             page=page,
-            per_page=per_page
+            per_page=per_page,
+            has_next=result.has_next,
+            next_cursor=result.next_cursor
         )
+        blog_cache.set(cache_key, blog_list, list_cache_tags(category.value, blog_responses), epoch)
+        return conditional_list(request, cache_key, blog_list)
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting posts by category {category}: {str(e)}")
-        raise HTTPException(status_code=500, detail="Internal server error")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.get("/blog/cache/stats")
+async def get_blog_cache_stats():
+    """Get blog read cache counters (admin endpoint)"""
+    return blog_cache.stats()
@@ -2,13 +2,31 @@ from fastapi import APIRouter, HTTPException, Query, Depends
 from typing import List, Optional
 from datetime import datetime
 import logging
+from pymongo import ReturnDocument
 
-from models.contact import ContactCreate, ContactResponse, ContactUpdate, ContactList, ContactStatus
+from models.contact import (
+    ContactCreate, ContactResponse, ContactUpdate, ContactList, ContactStatus, ContactBulkStatusUpdate
+)
 from database import get_database
+from pagination import SORT_ORDER, CountMode, fetch_page
+from ingest import BufferFull, contact_buffer
+from counters import increment_contact_stats, load_contact_stats
+from serialization import TrustedJSONResponse, trusted
+from export import ExportFormat, export_query, stream_export
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Ids matched per update_many in a bulk status change
+BULK_CHUNK_SIZE = 1000
+
+def build_contact_query(status: Optional[ContactStatus] = None) -> dict:
+    """Filter for a contact listing, shaped to match the contacts indexes"""
+    query = {}
+    if status:
+        query['status'] = status.value
+    return query
+
 @router.post("/contact", response_model=ContactResponse)
 async def create_contact(contact_data: ContactCreate, db = Depends(get_database)):
     """Submit a new contact form"""
@@ -22,15 +40,31 @@ async def create_contact(contact_data: ContactCreate, db = Depends(get_database)
         # Create contact object for response
         contact_obj = ContactResponse(**contact_dict)
         
+        # Hand off to the write-behind buffer when buffered ingestion is on
+        if contact_buffer.enabled:
+            try:
+                await contact_buffer.submit(contact_obj.dict())
+            except BufferFull:
+                raise HTTPException(
+                    status_code=503,
+                    detail="Too many submissions, please try again shortly",
+                    headers={"Retry-After": "1"}
+                )
+            logger.info(f"New contact form queued: {contact_obj.name} - {contact_obj.email}")
+            return contact_obj
+        
         # Insert into database
         result = await db.contacts.insert_one(contact_obj.dict())
         
         if result.inserted_id:
+            await increment_contact_stats(db, {contact_obj.status.value: 1})
             logger.info(f"New contact form submitted: {contact_obj.name} - {contact_obj.email}")
             return contact_obj
         else:
             raise HTTPException(status_code=500, detail="Failed to submit contact form")
             
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error creating contact: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -40,49 +74,123 @@ async def get_contacts(
     page: int = Query(1, ge=1),
     per_page: int = Query(10, ge=1, le=100),
     status: Optional[ContactStatus] = None,
+    cursor: Optional[str] = None,
+    count: CountMode = Query(CountMode.EXACT),
     db = Depends(get_database)
 ):
-    """Get all contacts (admin endpoint)"""
+    """Get all contacts (admin endpoint).
+
+    Pass the ``next_cursor`` of a previous response as ``cursor`` to seek
+    straight to the following page instead of skipping by ``page``.
+    ``count`` trades the accuracy of ``total`` for speed; with ``none``
+    only ``has_next`` is reported.
+    """
     try:
         # Build query
-        query = {}
-        if status:
-            query['status'] = status.value
-        
-        # Calculate pagination
-        skip = (page - 1) * per_page
+        query = build_contact_query(status)
         
-        # Get contacts
-        contacts_cursor = db.contacts.find(query).sort("created_at", -1).skip(skip).limit(per_page)
-        contacts = await contacts_cursor.to_list(length=per_page)
-        
-        # Get total count
-        total = await db.contacts.count_documents(query)
+        # Get contacts and total count, seeking past the cursor when one is given
+        skip = 0 if cursor else (page - 1) * per_page
+        try:
+            result = await fetch_page(
+                db.contacts, query, SORT_ORDER, skip, per_page, cursor=cursor, count=count, projection={"_id": 0}
+            )
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
         
         # Convert to response models
-        contact_responses = [ContactResponse(**contact) for contact in contacts]
+        contact_responses = [trusted(ContactResponse, contact) for contact in result.items]
         
-        return ContactList(
+        return TrustedJSONResponse(ContactList.model_construct(
             contacts=contact_responses,
-            total=total,
+            total=result.total,
             page=page,
-            per_page=per_page
-        )
+            per_page=per_page,
+            has_next=result.has_next,
+            next_cursor=result.next_cursor
+        ))
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting contacts: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+@router.put("/contact/bulk-status")
+async def bulk_update_contact_status(bulk_update: ContactBulkStatusUpdate, db = Depends(get_database)):
+    """Set the status of many contacts at once, selected by ``ids`` or by ``filter`` (admin endpoint).
+
+    Each update_many only matches contacts in one previous status, so the
+    status counters move by exactly the number of contacts changed.
+    """
+    if (bulk_update.ids is None) == (bulk_update.filter is None):
+        raise HTTPException(status_code=400, detail="Provide either ids or filter")
+    try:
+        new_status = bulk_update.status.value
+        previous_statuses = [status.value for status in ContactStatus if status != bulk_update.status]
+        
+        if bulk_update.ids is not None:
+            ids = list(dict.fromkeys(bulk_update.ids))
+            selections = [{"id": {"$in": ids[i:i + BULK_CHUNK_SIZE]}} for i in range(0, len(ids), BULK_CHUNK_SIZE)]
+        else:
+            contact_filter = bulk_update.filter
+            selection = build_contact_query(contact_filter.status)
+            if contact_filter.created_before or contact_filter.created_after:
+                selection['created_at'] = {}
+                if contact_filter.created_before:
+                    selection['created_at']['$lt'] = contact_filter.created_before
+                if contact_filter.created_after:
+                    selection['created_at']['$gte'] = contact_filter.created_after
+            # The status filter narrows the previous statuses to update from
+            if 'status' in selection:
+                filter_status = selection.pop('status')
+                previous_statuses = [status for status in previous_statuses if status == filter_status]
+            selections = [selection]
+        
+        by_previous_status = {}
+        for selection in selections:
+            for previous_status in previous_statuses:
+                result = await db.contacts.update_many(
+                    {**selection, "status": previous_status},
+                    {"$set": {"status": new_status, "updated_at": bulk_update.updated_at}}
+                )
+                if result.modified_count:
+                    await increment_contact_stats(db, {previous_status: -result.modified_count, new_status: result.modified_count})
+                    by_previous_status[previous_status] = by_previous_status.get(previous_status, 0) + result.modified_count
+        
+        modified = sum(by_previous_status.values())
+        logger.info(f"Bulk status update: {modified} contacts set to {new_status}")
+        return {"modified": modified, "status": new_status, "by_previous_status": by_previous_status}
+        
+    except Exception as e:
+        logger.error(f"Error bulk updating contact status: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.get("/contact/export")
+async def export_contacts(
+    format: ExportFormat = Query(ExportFormat.NDJSON),
+    status: Optional[ContactStatus] = None,
+    since: Optional[datetime] = None,
+    db = Depends(get_database)
+):
+    """Stream all contacts as NDJSON or CSV (admin endpoint).
+
+    Contacts come in ``updated_at`` order; pass the last ``updated_at`` seen
+    as ``since`` to export only what changed after a previous run.
+    """
+    query, sort = export_query(build_contact_query(status), since)
+    return stream_export(db.contacts, query, sort, format, list(ContactResponse.model_fields), "contacts")
+
 @router.get("/contact/{contact_id}", response_model=ContactResponse)
 async def get_contact(contact_id: str, db = Depends(get_database)):
     """Get a specific contact by ID"""
     try:
-        contact = await db.contacts.find_one({"id": contact_id})
+        contact = await db.contacts.find_one({"id": contact_id}, {"_id": 0})
         
         if not contact:
             raise HTTPException(status_code=404, detail="Contact not found")
         
-        return ContactResponse(**contact)
+        return TrustedJSONResponse(trusted(ContactResponse, contact))
         
     except HTTPException:
         raise
@@ -94,27 +202,27 @@ async def get_contact(contact_id: str, db = Depends(get_database)):
 async def update_contact(contact_id: str, contact_update: ContactUpdate, db = Depends(get_database)):
     """Update contact status (admin endpoint)"""
     try:
-        # Find existing contact
-        existing_contact = await db.contacts.find_one({"id": contact_id})
-        
-        if not existing_contact:
-            raise HTTPException(status_code=404, detail="Contact not found")
-        
         # Update fields
         update_data = contact_update.dict(exclude_unset=True)
         update_data['updated_at'] = datetime.utcnow()
         
-        # Update in database
-        result = await db.contacts.update_one(
+        # Update in one round trip; the previous status is needed for the
+        # counters, so take the pre-image and apply the $set to it locally
+        existing_contact = await db.contacts.find_one_and_update(
             {"id": contact_id},
-            {"$set": update_data}
+            {"$set": update_data},
+            projection={"_id": 0},
+            return_document=ReturnDocument.BEFORE
         )
         
-        if result.modified_count == 0:
-            raise HTTPException(status_code=400, detail="No changes made")
+        if not existing_contact:
+            raise HTTPException(status_code=404, detail="Contact not found")
+        
+        updated_contact = {**existing_contact, **update_data}
         
-        # Get updated contact
-        updated_contact = await db.contacts.find_one({"id": contact_id})
+        # Move the contact between status counters
+        if updated_contact['status'] != existing_contact['status']:
+            await increment_contact_stats(db, {existing_contact['status']: -1, updated_contact['status']: 1})
         
         logger.info(f"Contact {contact_id} updated by admin")
         return ContactResponse(**updated_contact)
@@ -129,11 +237,13 @@ async def update_contact(contact_id: str, contact_update: ContactUpdate, db = De
 async def delete_contact(contact_id: str, db = Depends(get_database)):
     """Delete a contact (admin endpoint)"""
     try:
-        result = await db.contacts.delete_one({"id": contact_id})
+        deleted_contact = await db.contacts.find_one_and_delete({"id": contact_id}, {"status": 1})
         
-        if result.deleted_count == 0:
+        if not deleted_contact:
             raise HTTPException(status_code=404, detail="Contact not found")
         
+        await increment_contact_stats(db, {deleted_contact['status']: -1})
+        
         logger.info(f"Contact {contact_id} deleted by admin")
         return {"message": "Contact deleted successfully"}
         
@@ -145,23 +255,18 @@ async def delete_contact(contact_id: str, db = Depends(get_database)):
 
 @router.get("/contact/stats/summary")
 async def get_contact_stats(db = Depends(get_database)):
-    """Get contact statistics (admin endpoint)"""
+    """Get contact statistics (admin endpoint).
+
+    Served from counters kept current by the write paths; run
+    ``python manage.py reconcile-contact-stats`` to rebuild them.
+    """
     try:
-        # Get counts by status
-        pipeline = [
-            {"$group": {"_id": "$status", "count": {"$sum": 1}}},
-            {"$sort": {"_id": 1}}
-        ]
-        
-        status_counts = await db.contacts.aggregate(pipeline).to_list(length=None)
-        
-        # Get total count
-        total_contacts = await db.contacts.count_documents({})
+        counts = await load_contact_stats(db)
         
         # Format response
         stats = {
-            "total_contacts": total_contacts,
-            "by_status": {item["_id"]: item["count"] for item in status_counts}
+            "total_contacts": counts["total"],
+            "by_status": {status: count for status, count in sorted(counts["by_status"].items()) if count}
         }
         
         return stats
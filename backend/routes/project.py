@@ -0,0 +1,132 @@
+from fastapi import APIRouter, HTTPException, Query, Depends
+from typing import Optional
+from datetime import datetime
+import logging
+
+from models.project import ProjectCreate, ProjectResponse, ProjectUpdate, ProjectList, ProjectCategory
+from database import get_database
+from snapshot import project_snapshot
+from coherence import generations
+from serialization import TrustedJSONResponse
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+@router.post("/projects", response_model=ProjectResponse)
+async def create_project(project_data: ProjectCreate, db = Depends(get_database)):
+    """Create a new project (admin endpoint)"""
+    try:
+        # Create project object for response
+        project_obj = ProjectResponse(**project_data.dict())
+
+        # Insert into database
+        result = await db.projects.insert_one(project_obj.dict())
+
+        if result.inserted_id:
+            await generations.bump(db, "projects", [project_obj.id])
+            await project_snapshot.bump(db)
+            logger.info(f"New project created: {project_obj.name}")
+            return project_obj
+        else:
+            raise HTTPException(status_code=500, detail="Failed to create project")
+
+    except Exception as e:
+        logger.error(f"Error creating project: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.get("/projects", response_model=ProjectList)
+async def get_projects(
+    page: int = Query(1, ge=1),
+    per_page: int = Query(20, ge=1, le=100),
+    category: Optional[ProjectCategory] = None,
+    featured: Optional[bool] = None,
+    db = Depends(get_database)
+):
+    """Get projects in display order, served from the in-memory snapshot"""
+    try:
+        snapshot = await project_snapshot.get(db)
+        projects = snapshot.select(category.value if category else None, featured)
+
+        # Calculate pagination
+        skip = (page - 1) * per_page
+
+        return TrustedJSONResponse(ProjectList.model_construct(
+            projects=list(projects[skip:skip + per_page]),
+            total=len(projects),
+            page=page,
+            per_page=per_page
+        ))
+
+    except Exception as e:
+        logger.error(f"Error getting projects: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.get("/projects/{project_id}", response_model=ProjectResponse)
+async def get_project(project_id: str, db = Depends(get_database)):
+    """Get a specific project by ID"""
+    try:
+        snapshot = await project_snapshot.get(db)
+        project = snapshot.by_id.get(project_id)
+
+        if not project:
+            raise HTTPException(status_code=404, detail="Project not found")
+
+        return TrustedJSONResponse(project)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting project {project_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.put("/projects/{project_id}", response_model=ProjectResponse)
+async def update_project(project_id: str, project_update: ProjectUpdate, db = Depends(get_database)):
+    """Update a project (admin endpoint)"""
+    try:
+        # Update fields
+        update_data = project_update.dict(exclude_unset=True)
+        update_data['updated_at'] = datetime.utcnow()
+
+        # Update in database
+        result = await db.projects.update_one(
+            {"id": project_id},
+            {"$set": update_data}
+        )
+
+        if result.matched_count == 0:
+            raise HTTPException(status_code=404, detail="Project not found")
+
+        await generations.bump(db, "projects", [project_id])
+
+        # The reloaded snapshot already holds the updated project
+        snapshot = await project_snapshot.bump(db)
+
+        logger.info(f"Project {project_id} updated")
+        return snapshot.by_id[project_id]
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error updating project {project_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.delete("/projects/{project_id}")
+async def delete_project(project_id: str, db = Depends(get_database)):
+    """Delete a project (admin endpoint)"""
+    try:
+        result = await db.projects.delete_one({"id": project_id})
+
+        if result.deleted_count == 0:
+            raise HTTPException(status_code=404, detail="Project not found")
+
+        await generations.bump(db, "projects", [project_id])
+        await project_snapshot.bump(db)
+
+        logger.info(f"Project {project_id} deleted")
+        return {"message": "Project deleted successfully"}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error deleting project {project_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
@@ -0,0 +1,56 @@
+from typing import Any, AsyncIterator, Dict, Tuple, Type, TypeVar
+
+import orjson
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+def trusted(model: Type[ModelT], doc: Dict[str, Any]) -> ModelT:
+    """Build a response model from a document this API wrote itself.
+
+    Documents in our collections were validated on the way in, so reads
+    skip validation and only fill in defaults for missing fields.
+    """
+    return model.model_construct(**doc)
+
+def _encode_model(obj):
+    if isinstance(obj, BaseModel):
+        return obj.__dict__
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+class TrustedJSONResponse(ORJSONResponse):
+    """JSON response rendered with orjson straight from model attributes.
+
+    Returning a Response skips FastAPI's response_model round trip, so the
+    routes using it only pass models built from trusted data.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_encode_model, option=orjson.OPT_NON_STR_KEYS)
+
+async def read_ndjson(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, Any]]:
+    """Parse a newline-delimited JSON body as it arrives.
+
+    Yields (line number, parsed value), or (line number, ValueError) for a
+    line that is not valid JSON so callers can report it per item. Blank
+    lines are skipped.
+    """
+    buffer = b""
+    line_no = 0
+
+    def parse(line: bytes):
+        try:
+            return orjson.loads(line)
+        except orjson.JSONDecodeError as e:
+            return ValueError(f"Invalid JSON: {e}")
+
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_no += 1
+            if line.strip():
+                yield line_no, parse(line)
+    if buffer.strip():
+        yield line_no + 1, parse(buffer)
@@ -1,20 +1,34 @@
 from fastapi import FastAPI, APIRouter
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from dotenv import load_dotenv
 from pathlib import Path
 import os
+import asyncio
 import logging
 
 # Import database functions
-from database import connect_to_mongo, close_mongo_connection, create_indexes, seed_database
+from database import connect_to_mongo, close_mongo_connection, ensure_indexes, get_database, ping_database, client_options
+from snapshot import project_snapshot
+from ingest import contact_buffer
+from cache import blog_cache
+from coherence import generations
+from related import related_index
+from suggest import suggest_index
+from metrics import RequestTimingMiddleware, pool_listener, register_collector, render_metrics
 
 # Import route modules
 from routes.contact import router as contact_router
 from routes.blog import router as blog_router
+from routes.project import router as project_router
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
+# auto: build indexes only when their fingerprint changed, always: rebuild
+# on every boot, skip: leave indexes to `python manage.py ensure-indexes`
+STARTUP_INDEX_MODE = os.environ.get('STARTUP_INDEX_MODE', 'auto')
+
 # Create the main app
 app = FastAPI(title="Portfolio API", version="1.0.0")
 
@@ -30,6 +44,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Record per-route request latency
+app.add_middleware(RequestTimingMiddleware)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -45,27 +62,112 @@ async def root():
 # Health check for database
 @api_router.get("/health")
 async def health_check():
+    pool = {
+        "options": client_options(),
+        "servers": pool_listener.stats()
+    }
+    try:
+        rtt = await ping_database()
+    except Exception as e:
+        logger.error(f"Health check ping failed: {e!r}")
+        return JSONResponse(status_code=503, content={
+            "status": "unhealthy",
+            "database": "unreachable",
+            "version": "1.0.0",
+            "pool": pool
+        })
     return {
         "status": "healthy",
         "database": "connected",
-        "version": "1.0.0"
+        "database_rtt_ms": round(rtt * 1000, 3),
+        "version": "1.0.0",
+        "pool": pool
     }
 
+def collect_runtime_stats():
+    cache_stats = blog_cache.stats()
+    buffer_stats = contact_buffer.stats()
+    yield ("blog_cache_entries", "gauge", "Entries in the blog response cache",
+           [({}, cache_stats["entries"])])
+    yield ("blog_cache_events_total", "counter", "Blog response cache events",
+           [({"event": event}, cache_stats[event])
+            for event in ("hits", "misses", "evictions", "expirations", "invalidations", "discarded")])
+    yield ("related_index_posts", "gauge", "Published posts in the related-posts index",
+           [({}, related_index.stats()["posts"])])
+    coherence_stats = generations.stats()
+    yield ("cache_generation_polls_total", "counter", "Reads of the cross-worker cache generations",
+           [({}, coherence_stats["polls"])])
+    yield ("cache_generation_refreshes_total", "counter", "Local cache refreshes caused by other workers' writes",
+           [({}, coherence_stats["invalidations"])])
+    yield ("contact_buffer_queued", "gauge", "Contact submissions waiting to be written",
+           [({}, buffer_stats["queued"])])
+    yield ("contact_buffer_documents_total", "counter", "Buffered contact submissions by outcome",
+           [({"outcome": "flushed"}, buffer_stats["flushed"]), ({"outcome": "failed"}, buffer_stats["failed"])])
+
+register_collector(collect_runtime_stats)
+
+async def refresh_blog_caches(db, post_ids):
+    """Drop this worker's blog reads after another worker wrote posts.
+
+    Compressed bodies are keyed by ETag and snapshot files are rewritten on
+    disk by the writing worker, so only the response cache and the
+    in-memory indexes need it. The related-posts index is updated for just
+    the written posts when they are known.
+    """
+    blog_cache.clear()
+    if post_ids is None:
+        if related_index.current is not None:
+            await related_index.build(db)
+    else:
+        await related_index.refresh(db, post_ids)
+    if suggest_index.current is not None:
+        await suggest_index.build(db)
+
+async def refresh_projects(db, project_ids):
+    await project_snapshot.bump(db)
+
+generations.on_change("blog_posts", refresh_blog_caches)
+generations.on_change("projects", refresh_projects)
+
+# Metrics in the Prometheus text format
+@api_router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
 # Include routers
 api_router.include_router(contact_router, tags=["contact"])
 api_router.include_router(blog_router, tags=["blog"])
+api_router.include_router(project_router, tags=["projects"])
 
 # Include API router in main app
 app.include_router(api_router)
 
+# Builds the blog indexes after startup; requests arriving first build on demand
+warmup_task = None
+
+async def warm_blog_indexes(db):
+    """Build the related-posts and suggestion indexes without holding up startup"""
+    for name, index in (("related-posts", related_index), ("suggestion", suggest_index)):
+        try:
+            await index.get(db)
+        except Exception as e:
+            logger.error(f"Failed to warm the {name} index: {str(e)}")
+
 # Startup event
 @app.on_event("startup")
 async def startup_event():
     """Initialize database connection and setup"""
+    global warmup_task
     try:
         await connect_to_mongo()
-        await create_indexes()
-        await seed_database()
+        if STARTUP_INDEX_MODE != "skip":
+            await ensure_indexes(force=STARTUP_INDEX_MODE == "always")
+        # Baseline the generations before loading anything they guard
+        await generations.start(get_database())
+        await project_snapshot.reload(get_database())
+        warmup_task = asyncio.create_task(warm_blog_indexes(get_database()))
+        if contact_buffer.enabled:
+            await contact_buffer.start(get_database())
         logger.info("✅ Application startup completed successfully")
     except Exception as e:
         logger.error(f"❌ Application startup failed: {e}")
@@ -75,5 +177,14 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     """Clean up database connection"""
+    # Drain buffered writes while the connection is still open
+    await contact_buffer.stop()
+    await generations.stop()
+    if warmup_task is not None and not warmup_task.done():
+        warmup_task.cancel()
+        try:
+            await warmup_task
+        except asyncio.CancelledError:
+            pass
     await close_mongo_connection()
     logger.info("✅ Application shutdown completed")
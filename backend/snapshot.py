@@ -0,0 +1,71 @@
+import asyncio
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from models.project import ProjectResponse
+
+logger = logging.getLogger(__name__)
+
+class ProjectSnapshot:
+    """Immutable view of every project, pre-sorted by order with precomputed filters"""
+
+    def __init__(self, projects: List[ProjectResponse], version: int):
+        self.version = version
+        self.projects: Tuple[ProjectResponse, ...] = tuple(
+            sorted(projects, key=lambda project: (project.order, project.created_at))
+        )
+        self.by_id: Dict[str, ProjectResponse] = {project.id: project for project in self.projects}
+
+        # Every (category, featured) view, with None meaning "not filtered"
+        self._views: Dict[Tuple[Optional[str], Optional[bool]], Tuple[ProjectResponse, ...]] = {}
+        categories = {project.category.value for project in self.projects}
+        for category in [None, *categories]:
+            for featured in (None, True, False):
+                self._views[(category, featured)] = tuple(
+                    project for project in self.projects
+                    if (category is None or project.category.value == category)
+                    and (featured is None or project.featured == featured)
+                )
+
+    def select(self, category: Optional[str] = None, featured: Optional[bool] = None) -> Tuple[ProjectResponse, ...]:
+        """Return the pre-sorted projects matching the filters"""
+        return self._views.get((category, featured), ())
+
+class ProjectSnapshotStore:
+    """Holds the current project snapshot and swaps in a new one on version bumps.
+
+    Readers only ever dereference ``current``; reloads build a complete new
+    snapshot before replacing it, so a read never sees a half-built view.
+    """
+
+    def __init__(self):
+        self.current: Optional[ProjectSnapshot] = None
+        self.version = 0
+        self._lock = asyncio.Lock()
+
+    async def get(self, db) -> ProjectSnapshot:
+        """Return the current snapshot, loading it on first use"""
+        snapshot = self.current
+        if snapshot is None:
+            snapshot = await self.reload(db)
+        return snapshot
+
+    async def bump(self, db) -> ProjectSnapshot:
+        """Record a write to the projects collection and reload"""
+        self.version += 1
+        return await self.reload(db)
+
+    async def reload(self, db) -> ProjectSnapshot:
+        """Rebuild the snapshot from the database unless it is already current"""
+        async with self._lock:
+            version = self.version
+            if self.current is not None and self.current.version >= version:
+                return self.current
+
+            docs = await db.projects.find({}, {"_id": 0}).to_list(length=None)
+            self.current = ProjectSnapshot([ProjectResponse(**doc) for doc in docs], version)
+            logger.info(f"Loaded project snapshot v{version} with {len(docs)} projects")
+            return self.current
+
+# Snapshot backing the public projects API
+project_snapshot = ProjectSnapshotStore()
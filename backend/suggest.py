@@ -0,0 +1,171 @@
+import asyncio
+import logging
+import os
+import re
+from bisect import bisect_left
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from dotenv import load_dotenv
+from fastapi import BackgroundTasks
+
+# Load environment variables
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+logger = logging.getLogger(__name__)
+
+# Most suggestions a request can ask for
+MAX_SUGGESTIONS = int(os.environ.get('SUGGEST_MAX_RESULTS', '10'))
+
+# Prefixes up to this length match large blocks of keys, so their results
+# are kept once computed
+SHORT_PREFIX_LENGTH = 2
+
+WORD = re.compile(r'\w+')
+
+def normalize(text: str) -> str:
+    """Lower-case and collapse whitespace so typed queries compare with indexed keys"""
+    return " ".join(text.lower().split())
+
+class SuggestState:
+    """Sorted prefix index over the titles, tags and categories of published posts.
+
+    Every entry is indexed under its full text and under the text from each
+    later word onwards, so "fast" finds "Building with FastAPI". A lookup
+    bisects to the block of keys sharing the query as a prefix and picks
+    the best-ranked entries in it.
+    """
+
+    def __init__(self, posts: List[dict]):
+        tag_counts: Counter = Counter()
+        tag_names: Dict[str, str] = {}
+        category_counts: Counter = Counter()
+        self.entries: List[dict] = []
+        weights: List[int] = []
+
+        for post in posts:
+            self.entries.append({"type": "post", "text": post["title"], "slug": post["slug"]})
+            weights.append(1)
+            category_counts[post["category"]] += 1
+            for tag in post.get("tags") or ():
+                key = normalize(tag)
+                if key:
+                    tag_counts[key] += 1
+                    tag_names.setdefault(key, tag.strip())
+        for key, count in tag_counts.items():
+            self.entries.append({"type": "tag", "text": tag_names[key], "count": count})
+            weights.append(count)
+        for category, count in category_counts.items():
+            self.entries.append({"type": "category", "text": category, "count": count})
+            weights.append(count)
+
+        # (key, starts at the first word, entry) for every word start of every entry
+        keyed: List[Tuple[str, bool, int]] = []
+        for entry_id, entry in enumerate(self.entries):
+            text = normalize(entry["text"])
+            starts = [match.start() for match in WORD.finditer(text)] or [0]
+            for position, start in enumerate(starts):
+                keyed.append((text[start:], position == 0, entry_id))
+        keyed.sort()
+        self.keys = [key for key, _, _ in keyed]
+        self._entry_ids = np.array([entry_id for _, _, entry_id in keyed], dtype=np.int64)
+
+        # Rank every key once so a lookup only picks the lowest ranks in its
+        # block: whole-text matches first, then by post count, then alphabetically
+        order = sorted(
+            range(len(keyed)),
+            key=lambda i: (not keyed[i][1], -weights[keyed[i][2]], normalize(self.entries[keyed[i][2]]["text"]))
+        )
+        self._ranks = np.empty(len(keyed), dtype=np.int64)
+        self._ranks[order] = np.arange(len(keyed))
+        self._short: Dict[str, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _top(self, start: int, end: int, limit: int) -> List[int]:
+        """The best-ranked distinct entries among keys[start:end]"""
+        ranks = self._ranks[start:end]
+        candidates = len(ranks)
+        # An entry can match under several of its words, so take spare candidates
+        wanted = min(candidates, limit * 4)
+        while True:
+            if wanted < candidates:
+                picked = np.argpartition(ranks, wanted - 1)[:wanted]
+                picked = picked[np.argsort(ranks[picked])]
+            else:
+                picked = np.argsort(ranks)
+            ranked = list(dict.fromkeys(self._entry_ids[start + picked].tolist()))
+            if len(ranked) >= limit or wanted >= candidates:
+                return ranked[:limit]
+            wanted = min(candidates, wanted * 4)
+
+    def suggest(self, query: str, limit: int) -> List[dict]:
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        ranked = self._short.get(prefix) if len(prefix) <= SHORT_PREFIX_LENGTH else None
+        if ranked is None:
+            start = bisect_left(self.keys, prefix)
+            end = bisect_left(self.keys, prefix + "\uffff", start)
+            if start == end:
+                return []
+            if len(prefix) <= SHORT_PREFIX_LENGTH:
+                # Only prefixes of indexed keys get here, which bounds the cache
+                ranked = self._short[prefix] = self._top(start, end, MAX_SUGGESTIONS)
+            else:
+                ranked = self._top(start, end, limit)
+        return [self.entries[entry_id] for entry_id in ranked[:limit]]
+
+class SuggestIndex:
+    """Holds the current prefix index and rebuilds it after blog writes.
+
+    Rebuilds read only titles, slugs, tags and categories, and requests
+    made while one is pending collapse into a single rebuild.
+    """
+
+    def __init__(self):
+        self.current: Optional[SuggestState] = None
+        self._stale = False
+        self._lock = asyncio.Lock()
+
+    async def build(self, db) -> SuggestState:
+        async with self._lock:
+            return await self._build(db)
+
+    async def _build(self, db) -> SuggestState:
+        self._stale = False
+        posts = await db.blog_posts.find(
+            {"published": True}, {"_id": 0, "title": 1, "slug": 1, "tags": 1, "category": 1}
+        ).to_list(length=None)
+        self.current = await asyncio.to_thread(SuggestState, posts)
+        return self.current
+
+    async def get(self, db) -> SuggestState:
+        """Return the current index, building it on first use"""
+        state = self.current
+        if state is None:
+            async with self._lock:
+                # A build may have finished while this request waited
+                state = self.current or await self._build(db)
+        return state
+
+    def changed(self, db, background_tasks: BackgroundTasks):
+        """Rebuild once the response is sent, unless a rebuild is already queued"""
+        # A build in progress may have read the posts before this write
+        if (self.current is None and not self._lock.locked()) or self._stale:
+            return
+        self._stale = True
+        background_tasks.add_task(self._rebuild_logged, db)
+
+    async def _rebuild_logged(self, db):
+        try:
+            await self.build(db)
+        except Exception as e:
+            self._stale = False
+            logger.error(f"Failed to rebuild blog suggestions: {str(e)}")
+
+suggest_index = SuggestIndex()
@@ -0,0 +1,533 @@
+"""Load-test and micro-benchmark suite for the Portfolio API.
+
+Seeds a database with synthetic posts and contacts in chunks, drives every endpoint
+in server.py through the ASGI app with concurrent clients, and writes
+throughput and latency percentiles as JSON.
+
+By default it runs against an in-process async fake of the Motor
+collections (mongomock-motor). Pass --mongo-url to benchmark a real mongod
+instead; that is the only realistic option for the larger volumes.
+
+    python -m tests.benchmark --posts 10000 --contacts 10000 --output bench.json
+    python -m tests.benchmark --baseline bench.json --max-regression 15
+
+With --baseline, the run exits non-zero when any scenario's p95 latency
+regresses by more than --max-regression percent.
+
+The report's "comparisons" pit alternative implementations of the same
+request against each other, e.g. the find + count_documents and $facet
+paths of an exact count. Only a real mongod gives meaningful numbers:
+
+    python -m tests.benchmark --mongo-url mongodb://localhost:27017 --disable-cache \
+        --only blog_list_count_exact blog_list_count_facet contact_list contact_list_count_facet
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import platform
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+import httpx
+
+import database
+from cache import blog_cache
+from pagination import SORT_ORDER, encode_cursor
+from related import related_index
+from snapshot import project_snapshot
+from suggest import suggest_index
+
+BENCH_DB_NAME = "portfolio_benchmark"
+CATEGORIES = ["AI", "Backend", "Frontend", "General"]
+CONTACT_STATUSES = ["new", "read", "responded"]
+PROJECT_CATEGORIES = ["AI/ML", "Full Stack"]
+WORDS = (
+    "api async cache cluster component database deploy docker fastapi frontend index "
+    "javascript kubernetes latency model mongo network python query react render scale "
+    "schema search server service stream testing throughput typescript vector worker"
+).split()
+
+class Request(NamedTuple):
+    method: str
+    url: str
+    json: Optional[dict] = None
+    headers: Optional[dict] = None
+    content: Optional[bytes] = None
+
+class Scenario(NamedTuple):
+    name: str
+    build: Callable[[int], Request]
+    expected: tuple = (200,)
+
+class Dataset(NamedTuple):
+    """What the scenarios need of the seeded data; the documents stay in the database.
+
+    Post n has the slug post-<n>, so only ids are kept per document.
+    """
+    post_ids: List[str]
+    published: List[Tuple[str, str]]
+    contact_ids: List[str]
+    project_ids: List[str]
+    post_cursor: Optional[str]
+    contact_cursor: Optional[str]
+
+# Published posts whose slug and title are kept for the related and suggest scenarios
+PUBLISHED_SAMPLE = 1000
+
+def text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+def generate_posts(rng: random.Random, count: int, content_words: int, start: datetime) -> Iterator[dict]:
+    """Deterministic synthetic posts shaped like the ones the API writes, generated one at a time"""
+    for i in range(count):
+        created_at = start + timedelta(minutes=rng.randrange(3_000_000))
+        title = f"{text(rng, 6).title()} {i}"
+        yield {
+            "id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "title": title,
+            "slug": f"post-{i}",
+            "excerpt": text(rng, 30),
+            "content": text(rng, content_words),
+            "author": "Amit",
+            "category": rng.choice(CATEGORIES),
+            "tags": rng.sample(WORDS, 3),
+            "image": None,
+            "read_time": f"{max(1, content_words // 200)} min read",
+            "published": rng.random() < 0.9,
+            "created_at": created_at,
+            "updated_at": created_at
+        }
+
+def generate_contacts(rng: random.Random, count: int, start: datetime) -> Iterator[dict]:
+    for i in range(count):
+        created_at = start + timedelta(minutes=rng.randrange(3_000_000))
+        yield {
+            "id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "name": f"Visitor {i}",
+            "email": f"visitor{i}@example.com",
+            "subject": text(rng, 5),
+            "message": text(rng, 60),
+            "status": rng.choice(CONTACT_STATUSES),
+            "created_at": created_at,
+            "updated_at": created_at
+        }
+
+def generate_projects(rng: random.Random, count: int, start: datetime) -> Iterator[dict]:
+    for i in range(count):
+        yield {
+            "id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "name": f"Project {i}",
+            "description": text(rng, 25),
+            "tech_stack": rng.sample(WORDS, 4),
+            "category": rng.choice(PROJECT_CATEGORIES),
+            "image": None,
+            "demo_url": None,
+            "github_url": None,
+            "featured": i < 3,
+            "order": i,
+            "created_at": start,
+            "updated_at": start
+        }
+
+async def insert_chunked(collection, docs: Iterable[dict], chunk_size: int, keep: Callable[[dict], None]):
+    """Insert generated documents a chunk at a time, handing each to keep first"""
+    chunk = []
+    for doc in docs:
+        keep(doc)
+        chunk.append(doc)
+        if len(chunk) >= chunk_size:
+            await collection.insert_many(chunk)
+            chunk = []
+    if chunk:
+        await collection.insert_many(chunk)
+
+async def cursor_after(collection, position: int) -> Optional[str]:
+    """The cursor a client holds after reading the first position documents of the listing"""
+    if position <= 0:
+        return None
+    cursor = collection.find({}, {"_id": 0, "id": 1, "created_at": 1}).sort(SORT_ORDER)
+    docs = await cursor.skip(position - 1).limit(1).to_list(length=1)
+    return encode_cursor(docs[0]) if docs else None
+
+async def seed(db, posts: int, contacts: int, projects: int, content_words: int, seed_value: int,
+               chunk_size: int = 10_000) -> Dataset:
+    """Generate and load the synthetic data in chunks, on top of empty collections.
+
+    The cursor anchors are left unset; add_cursors fills them in once the
+    indexes exist.
+    """
+    rng = random.Random(seed_value)
+    start = datetime(2020, 1, 1)
+    post_ids: List[str] = []
+    published: List[Tuple[str, str]] = []
+    contact_ids: List[str] = []
+    project_ids: List[str] = []
+
+    def keep_post(doc: dict):
+        post_ids.append(doc["id"])
+        if doc["published"] and len(published) < PUBLISHED_SAMPLE:
+            published.append((doc["slug"], doc["title"]))
+
+    for name in ("blog_posts", "contacts", "projects"):
+        await db[name].delete_many({})
+    await db.counters.delete_many({})
+    await insert_chunked(db.blog_posts, generate_posts(rng, posts, content_words, start), chunk_size, keep_post)
+    await insert_chunked(db.contacts, generate_contacts(rng, contacts, start), chunk_size,
+                         lambda doc: contact_ids.append(doc["id"]))
+    await insert_chunked(db.projects, generate_projects(rng, projects, start), chunk_size,
+                         lambda doc: project_ids.append(doc["id"]))
+    return Dataset(post_ids, published, contact_ids, project_ids, None, None)
+
+async def add_cursors(db, dataset: Dataset) -> Dataset:
+    """Anchor the deep cursor scenarios halfway through each listing"""
+    return dataset._replace(
+        post_cursor=await cursor_after(db.blog_posts, len(dataset.post_ids) // 2),
+        contact_cursor=await cursor_after(db.contacts, len(dataset.contact_ids) // 2)
+    )
+
+def build_scenarios(dataset: Dataset, real_mongo: bool, per_page: int) -> List[Scenario]:
+    """One scenario per endpoint, plus variants for the pagination and search modes"""
+    post_ids = dataset.post_ids
+    contact_ids = dataset.contact_ids
+    project_ids = dataset.project_ids
+    published = dataset.published
+    deep_post = len(post_ids) // 2
+    deep_contact = len(contact_ids) // 2
+    post_cursor = dataset.post_cursor
+    contact_cursor = dataset.contact_cursor
+    search_mode = "text" if real_mongo else "substring"
+
+    def pick_index(count: int, i: int) -> int:
+        return (i * 7919) % count
+
+    def pick(items: list, i: int):
+        return items[pick_index(len(items), i)]
+
+    def tail(items: list, i: int):
+        return items[-(i % len(items)) - 1]
+
+    def post_slug(i: int) -> str:
+        return f"post-{pick_index(len(post_ids), i)}"
+
+    def create_contact(i: int) -> Request:
+        return Request("POST", "/api/contact", json={
+            "name": f"Bench {i}", "email": f"bench{i}@example.com", "subject": "Benchmark", "message": "Load test"
+        })
+
+    def create_post(i: int) -> Request:
+        return Request("POST", "/api/blog", json={
+            "title": f"Benchmark post {i} {uuid.uuid4().hex[:8]}", "excerpt": "Benchmark", "content": "Load test " * 50,
+            "category": CATEGORIES[i % len(CATEGORIES)], "tags": ["benchmark"], "published": True
+        })
+
+    def create_project(i: int) -> Request:
+        return Request("POST", "/api/projects", json={
+            "name": f"Benchmark project {i}", "description": "Load test", "tech_stack": ["python", "mongodb"],
+            "category": PROJECT_CATEGORIES[i % len(PROJECT_CATEGORIES)], "order": 1000 + i
+        })
+
+    def bulk_posts(i: int) -> Request:
+        lines = (json.dumps({
+            "title": f"Bulk post {i} {n} {uuid.uuid4().hex[:8]}", "excerpt": "Benchmark", "content": "Load test " * 50,
+            "category": CATEGORIES[n % len(CATEGORIES)], "tags": ["benchmark"], "published": True
+        }) for n in range(20))
+        return Request("POST", "/api/blog/bulk", content="\n".join(lines).encode(),
+                       headers={"Content-Type": "application/x-ndjson"})
+
+    scenarios = [
+        Scenario("root", lambda i: Request("GET", "/api/")),
+        Scenario("health", lambda i: Request("GET", "/api/health")),
+        Scenario("blog_list", lambda i: Request("GET", f"/api/blog?per_page={per_page}")),
+        Scenario("blog_list_summary", lambda i: Request("GET", f"/api/blog?per_page={per_page}&view=summary")),
+        Scenario("blog_list_count_exact", lambda i: Request("GET", f"/api/blog?per_page={per_page}&published_only=false&count=exact")),
+        Scenario("blog_list_count_facet", lambda i: Request("GET", f"/api/blog?per_page={per_page}&published_only=false&count=facet")),
+        Scenario("blog_list_count_estimated", lambda i: Request("GET", f"/api/blog?per_page={per_page}&published_only=false&count=estimated")),
+        Scenario("blog_list_count_none", lambda i: Request("GET", f"/api/blog?per_page={per_page}&published_only=false&count=none")),
+        Scenario("blog_list_deep_page", lambda i: Request(
+            "GET", f"/api/blog?per_page={per_page}&published_only=false&page={deep_post // per_page + 1}"
+        )),
+        Scenario("blog_search", lambda i: Request(
+            "GET", f"/api/blog?per_page={per_page}&search={WORDS[i % len(WORDS)]}&search_mode={search_mode}"
+        )),
+        Scenario("blog_category", lambda i: Request("GET", f"/api/blog/category/{CATEGORIES[i % len(CATEGORIES)]}?per_page={per_page}")),
+        Scenario("blog_post", lambda i: Request("GET", f"/api/blog/{post_slug(i)}")),
+        Scenario("blog_related", lambda i: Request("GET", f"/api/blog/{pick(published, i)[0]}/related")),
+        Scenario("blog_suggest", lambda i: Request("GET", f"/api/blog/suggest?q={pick(published, i)[1][:1 + i % 6]}")),
+        Scenario("blog_facets", lambda i: Request("GET", "/api/blog/facets")),
+        Scenario("blog_list_gzip", lambda i: Request(
+            "GET", f"/api/blog?per_page={per_page}", headers={"Accept-Encoding": "gzip"}
+        )),
+        Scenario("blog_post_br", lambda i: Request(
+            "GET", f"/api/blog/{post_slug(i)}", headers={"Accept-Encoding": "br, gzip"}
+        )),
+        Scenario("blog_cache_stats", lambda i: Request("GET", "/api/blog/cache/stats")),
+        Scenario("metrics", lambda i: Request("GET", "/api/metrics")),
+        Scenario("contact_list", lambda i: Request("GET", f"/api/contact?per_page={per_page}")),
+        Scenario("contact_list_status", lambda i: Request(
+            "GET", f"/api/contact?per_page={per_page}&status={CONTACT_STATUSES[i % len(CONTACT_STATUSES)]}"
+        )),
+        Scenario("contact_list_count_facet", lambda i: Request("GET", f"/api/contact?per_page={per_page}&count=facet")),
+        Scenario("contact_list_count_none", lambda i: Request("GET", f"/api/contact?per_page={per_page}&count=none")),
+        Scenario("contact_list_deep_page", lambda i: Request(
+            "GET", f"/api/contact?per_page={per_page}&page={deep_contact // per_page + 1}"
+        )),
+        Scenario("contact_get", lambda i: Request("GET", f"/api/contact/{pick(contact_ids, i)}")),
+        Scenario("contact_stats", lambda i: Request("GET", "/api/contact/stats/summary")),
+        Scenario("contact_export", lambda i: Request("GET", "/api/contact/export")),
+        Scenario("blog_export_csv", lambda i: Request("GET", "/api/blog/export?format=csv&published_only=false")),
+        Scenario("projects_list", lambda i: Request("GET", "/api/projects")),
+        Scenario("projects_featured", lambda i: Request("GET", "/api/projects?featured=true")),
+        Scenario("project_get", lambda i: Request("GET", f"/api/projects/{pick(project_ids, i)}")),
+    ]
+    if post_cursor:
+        scenarios.append(Scenario("blog_list_deep_cursor", lambda i: Request(
+            "GET", f"/api/blog?per_page={per_page}&published_only=false&cursor={post_cursor}"
+        )))
+    if contact_cursor:
+        scenarios.append(Scenario("contact_list_deep_cursor", lambda i: Request(
+            "GET", f"/api/contact?per_page={per_page}&cursor={contact_cursor}"
+        )))
+
+    # Writes run last so that they do not disturb the read measurements
+    scenarios += [
+        Scenario("contact_create", create_contact),
+        Scenario("contact_update", lambda i: Request(
+            "PUT", f"/api/contact/{pick(contact_ids, i)}", json={"status": CONTACT_STATUSES[i % len(CONTACT_STATUSES)]}
+        )),
+        Scenario("blog_create", create_post),
+        Scenario("blog_bulk_create", bulk_posts),
+        Scenario("contact_bulk_status", lambda i: Request("PUT", "/api/contact/bulk-status", json={
+            "status": CONTACT_STATUSES[i % len(CONTACT_STATUSES)], "ids": [pick(contact_ids, i + n) for n in range(20)]
+        })),
+        Scenario("blog_update", lambda i: Request("PUT", f"/api/blog/{pick(post_ids, i)}", json={"excerpt": f"Revised {i}"})),
+        Scenario("project_create", create_project),
+        Scenario("project_update", lambda i: Request("PUT", f"/api/projects/{pick(project_ids, i)}", json={"order": i})),
+        # Deletes walk the seeded documents from the end; a run longer than
+        # the collection revisits them and gets 404s
+        Scenario("contact_delete", lambda i: Request("DELETE", f"/api/contact/{tail(contact_ids, i)}"), (200, 404)),
+        Scenario("blog_delete", lambda i: Request("DELETE", f"/api/blog/{tail(post_ids, i)}"), (200, 404)),
+        Scenario("project_delete", lambda i: Request("DELETE", f"/api/projects/{tail(project_ids, i)}"), (200, 404)),
+    ]
+    return scenarios
+
+# (baseline, candidate) scenarios sending the same request through different code paths
+COMPARISONS = [
+    ("blog_list_count_exact", "blog_list_count_facet"),
+    ("contact_list", "contact_list_count_facet"),
+]
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+async def run_scenario(client: httpx.AsyncClient, scenario: Scenario, requests: int, concurrency: int) -> dict:
+    """Issue requests from concurrent workers and summarize their latencies"""
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    counter = iter(range(requests))
+
+    async def worker():
+        for i in counter:
+            request = scenario.build(i)
+            started = time.perf_counter()
+            try:
+                response = await client.request(
+                    request.method, request.url, json=request.json, headers=request.headers, content=request.content
+                )
+                status = response.status_code
+            except Exception as e:
+                status = type(e).__name__
+            latencies.append((time.perf_counter() - started) * 1000)
+            if status not in scenario.expected:
+                errors[str(status)] = errors.get(str(status), 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": sum(errors.values()),
+        "error_statuses": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "max_ms": round(latencies[-1], 3) if latencies else 0.0
+    }
+
+async def run_benchmark(
+    posts: int = 10_000,
+    contacts: int = 10_000,
+    projects: int = 20,
+    requests: int = 200,
+    concurrency: int = 16,
+    per_page: int = 10,
+    content_words: int = 400,
+    mongo_url: Optional[str] = None,
+    disable_cache: bool = False,
+    only: Optional[List[str]] = None,
+    keep: bool = False,
+    seed_value: int = 42
+) -> dict:
+    """Seed a database, drive every scenario against it and return the report"""
+    from server import app
+
+    if mongo_url:
+        from motor.motor_asyncio import AsyncIOMotorClient
+        client = AsyncIOMotorClient(mongo_url)
+        backend = "mongod"
+    else:
+        from mongomock_motor import AsyncMongoMockClient
+        client = AsyncMongoMockClient()
+        backend = "fake"
+    database.client = client
+    database.database = client[BENCH_DB_NAME]
+    db = database.database
+
+    seed_started = time.perf_counter()
+    dataset = await seed(db, posts, contacts, projects, content_words, seed_value)
+    if mongo_url:
+        await database.create_indexes()
+    dataset = await add_cursors(db, dataset)
+    seed_seconds = time.perf_counter() - seed_started
+
+    # Start every run from cold in-process state
+    blog_cache.clear()
+    if disable_cache:
+        blog_cache.max_entries = 0
+    project_snapshot.current = None
+    related_index.current = None
+    suggest_index.current = None
+
+    scenarios = build_scenarios(dataset, real_mongo=bool(mongo_url), per_page=per_page)
+    if only:
+        scenarios = [scenario for scenario in scenarios if scenario.name in only]
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as http:
+        for scenario in scenarios:
+            results[scenario.name] = await run_scenario(http, scenario, requests, concurrency)
+
+    if mongo_url and not keep:
+        await client.drop_database(BENCH_DB_NAME)
+
+    return {
+        "meta": {
+            "backend": backend,
+            "posts": posts,
+            "contacts": contacts,
+            "projects": projects,
+            "requests_per_scenario": requests,
+            "concurrency": concurrency,
+            "per_page": per_page,
+            "content_words": content_words,
+            "cache": not disable_cache,
+            "seed_seconds": round(seed_seconds, 3),
+            "python": platform.python_version(),
+            "timestamp": datetime.utcnow().isoformat()
+        },
+        "scenarios": results,
+        "comparisons": compare_scenarios(results)
+    }
+
+def compare_scenarios(scenarios: Dict[str, dict], pairs=COMPARISONS) -> List[dict]:
+    """Latency of each candidate relative to its baseline; above 1 means the candidate is slower"""
+    comparisons = []
+    for baseline, candidate in pairs:
+        if baseline not in scenarios or candidate not in scenarios:
+            continue
+        comparison = {"baseline": baseline, "candidate": candidate}
+        for metric in ("p50_ms", "p95_ms"):
+            base = scenarios[baseline][metric]
+            comparison[f"{metric[:-3]}_ratio"] = round(scenarios[candidate][metric] / base, 2) if base else None
+        comparisons.append(comparison)
+    return comparisons
+
+def find_regressions(report: dict, baseline: dict, max_regression: float, metric: str = "p95_ms") -> List[dict]:
+    """Scenarios whose latency metric got worse than the baseline by more than max_regression percent"""
+    regressions = []
+    for name, result in report["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous or not previous.get(metric):
+            continue
+        change = (result[metric] - previous[metric]) / previous[metric] * 100
+        if change > max_regression:
+            regressions.append({
+                "scenario": name,
+                "metric": metric,
+                "baseline": previous[metric],
+                "current": result[metric],
+                "change_pct": round(change, 1)
+            })
+    return regressions
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark every Portfolio API endpoint")
+    parser.add_argument("--posts", type=int, default=10_000, help="blog posts to seed")
+    parser.add_argument("--contacts", type=int, default=10_000, help="contacts to seed")
+    parser.add_argument("--projects", type=int, default=20, help="projects to seed")
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent clients per scenario")
+    parser.add_argument("--per-page", type=int, default=10, help="page size for list scenarios")
+    parser.add_argument("--content-words", type=int, default=400, help="words per post body")
+    parser.add_argument("--mongo-url", help="benchmark a real mongod instead of the in-process fake")
+    parser.add_argument("--disable-cache", action="store_true", help="bypass the in-process blog cache")
+    parser.add_argument("--only", nargs="*", help="run only the named scenarios")
+    parser.add_argument("--keep", action="store_true", help="keep the seeded database on a real mongod")
+    parser.add_argument("--seed", type=int, default=42, help="random seed for the synthetic data")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--baseline", help="previous JSON report to compare p95 latencies against")
+    parser.add_argument("--max-regression", type=float, default=20.0, help="allowed p95 regression in percent")
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.INFO)
+    report = asyncio.run(run_benchmark(
+        posts=args.posts,
+        contacts=args.contacts,
+        projects=args.projects,
+        requests=args.requests,
+        concurrency=args.concurrency,
+        per_page=args.per_page,
+        content_words=args.content_words,
+        mongo_url=args.mongo_url,
+        disable_cache=args.disable_cache,
+        only=args.only,
+        keep=args.keep,
+        seed_value=args.seed
+    ))
+
+    exit_code = 0
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        report["regressions"] = find_regressions(report, baseline, args.max_regression)
+        exit_code = 1 if report["regressions"] else 0
+    if any(result["errors"] for result in report["scenarios"].values()):
+        exit_code = 1
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    else:
+        print(output)
+    return exit_code
+
+if __name__ == "__main__":
+    sys.exit(main())
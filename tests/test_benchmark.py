@@ -0,0 +1,39 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("mongomock_motor")
+
+from tests.benchmark import compare_scenarios, find_regressions, percentile, run_benchmark
+
+def test_every_scenario_runs_against_the_fake_backend():
+    report = asyncio.run(run_benchmark(posts=40, contacts=40, projects=5, requests=4, concurrency=2))
+
+    assert report["meta"]["backend"] == "fake"
+    for name, result in report["scenarios"].items():
+        assert result["requests"] == 4, name
+        assert result["errors"] == 0, (name, result["error_statuses"])
+        assert result["p50_ms"] <= result["p95_ms"] <= result["p99_ms"] <= result["max_ms"]
+
+def test_percentile_uses_nearest_rank():
+    values = [float(i) for i in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 99) == 0.0
+
+def test_regressions_compare_p95_against_baseline():
+    baseline = {"scenarios": {"blog_list": {"p95_ms": 10.0}, "blog_post": {"p95_ms": 10.0}}}
+    report = {"scenarios": {"blog_list": {"p95_ms": 13.0}, "blog_post": {"p95_ms": 11.0}, "new": {"p95_ms": 50.0}}}
+
+    regressions = find_regressions(report, baseline, max_regression=20)
+
+    assert [regression["scenario"] for regression in regressions] == ["blog_list"]
+    assert regressions[0]["change_pct"] == 30.0
+
+def test_comparisons_report_candidate_latency_relative_to_baseline():
+    scenarios = {"exact": {"p50_ms": 2.0, "p95_ms": 4.0}, "facet": {"p50_ms": 5.0, "p95_ms": 10.0}}
+
+    comparisons = compare_scenarios(scenarios, [("exact", "facet"), ("exact", "missing")])
+
+    assert comparisons == [{"baseline": "exact", "candidate": "facet", "p50_ratio": 2.5, "p95_ratio": 2.5}]
@@ -0,0 +1,178 @@
+"""The blog response cache: LRU and TTL bounds, and what each blog write drops from it.
+
+The route tests run against mongomock_motor and skip when it is not installed.
+"""
+import asyncio
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+import cache
+from cache import ResponseCache, blog_cache
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache.time, "monotonic", clock)
+    return clock
+
+def test_least_recently_used_entry_is_evicted_first():
+    responses = ResponseCache(max_entries=2)
+    responses.set("a", 1)
+    responses.set("b", 2)
+    assert responses.get("a") == 1
+
+    responses.set("c", 3)
+
+    assert responses.get("b") is None
+    assert responses.get("a") == 1
+    assert responses.get("c") == 3
+    assert responses.stats()["evictions"] == 1
+
+def test_entries_expire_after_the_ttl(clock):
+    responses = ResponseCache(ttl_seconds=10)
+    responses.set("a", 1, ["post:1"])
+
+    clock.now += 9.9
+    assert responses.get("a") == 1
+    clock.now += 0.2
+    assert responses.get("a") is None
+    assert responses.stats()["expirations"] == 1
+    # The expired entry no longer answers to its tags
+    assert responses.invalidate("post:1") == 0
+
+def test_invalidate_drops_every_entry_under_any_given_tag():
+    responses = ResponseCache()
+    responses.set("list", 1, ["list", "post:1", "post:2"])
+    responses.set("post-1", 2, ["post:1"])
+    responses.set("post-3", 3, ["post:3"])
+
+    assert responses.invalidate("post:1") == 2
+
+    assert responses.get("list") is None
+    assert responses.get("post-1") is None
+    assert responses.get("post-3") == 3
+
+def test_fill_started_before_an_invalidation_is_discarded():
+    responses = ResponseCache()
+    epoch = responses.epoch
+
+    # A write lands while the read is still querying
+    responses.invalidate("post:1")
+    responses.set("post-1", "before the write", ["post:1"], epoch)
+    assert responses.get("post-1") is None
+    assert responses.stats()["discarded"] == 1
+
+    responses.set("post-1", "after the write", ["post:1"], responses.epoch)
+    assert responses.get("post-1") == "after the write"
+
+def test_clear_also_discards_fills_in_flight():
+    responses = ResponseCache()
+    epoch = responses.epoch
+    responses.clear()
+    responses.set("a", 1, epoch=epoch)
+    assert responses.get("a") is None
+
+def post(i: int, category: str) -> dict:
+    created_at = datetime(2024, 1, 1) + timedelta(hours=i)
+    return {
+        "id": f"post-{i}", "title": f"Post {i}", "slug": f"post-{i}", "excerpt": "Excerpt",
+        "content": "Content", "author": "Amit", "category": category, "tags": [], "image": None,
+        "read_time": None, "published": True, "created_at": created_at, "updated_at": created_at
+    }
+
+@pytest.fixture
+def client(monkeypatch):
+    pytest.importorskip("mongomock_motor")
+    from fastapi.testclient import TestClient
+    from mongomock_motor import AsyncMongoMockClient
+
+    import database
+    import server
+
+    db = AsyncMongoMockClient()["portfolio_cache"]
+    asyncio.run(db.blog_posts.insert_many(
+        [post(i, "AI") for i in range(3)] + [post(i, "Backend") for i in range(3, 6)]
+    ))
+    monkeypatch.setattr(database, "database", db)
+    blog_cache.clear()
+    yield TestClient(server.app)
+    blog_cache.clear()
+
+URLS = {
+    "all": "/api/blog",
+    "ai": "/api/blog/category/AI",
+    "backend": "/api/blog/category/Backend",
+    "post-0": "/api/blog/post-0",
+    "post-3": "/api/blog/post-3",
+}
+
+def warm(client):
+    for url in URLS.values():
+        assert client.get(url).status_code == 200
+
+def cached(client) -> set:
+    """Names of the URLS answered from the cache, without disturbing it for the others"""
+    served = set()
+    for name, url in URLS.items():
+        hits = blog_cache.hits
+        client.get(url)
+        if blog_cache.hits > hits:
+            served.add(name)
+    return served
+
+def test_update_that_keeps_membership_drops_only_pages_showing_the_post(client):
+    warm(client)
+    assert client.put("/api/blog/post-0", json={"excerpt": "Revised"}).status_code == 200
+
+    assert cached(client) == {"backend", "post-3"}
+    assert client.get("/api/blog/post-0").json()["excerpt"] == "Revised"
+    ai = client.get(URLS["ai"]).json()["posts"]
+    assert [p["excerpt"] for p in ai if p["id"] == "post-0"] == ["Revised"]
+
+def test_update_that_moves_the_post_drops_both_categories(client):
+    warm(client)
+    assert client.put("/api/blog/post-0", json={"category": "Backend"}).status_code == 200
+
+    assert cached(client) == {"post-3"}
+    backend = [p["id"] for p in client.get(URLS["backend"]).json()["posts"]]
+    ai = [p["id"] for p in client.get(URLS["ai"]).json()["posts"]]
+    assert "post-0" in backend and "post-0" not in ai
+
+def test_unpublishing_drops_the_listings_it_leaves(client):
+    warm(client)
+    assert client.put("/api/blog/post-3", json={"published": False}).status_code == 200
+
+    assert cached(client) == {"ai", "post-0"}
+    assert "post-3" not in [p["id"] for p in client.get(URLS["all"]).json()["posts"]]
+
+def test_create_drops_the_listings_it_joins(client):
+    warm(client)
+    response = client.post("/api/blog", json={
+        "title": "Fresh", "excerpt": "Excerpt", "content": "Content", "category": "AI", "published": True
+    })
+    assert response.status_code == 200
+
+    assert cached(client) == {"backend", "post-0", "post-3"}
+    assert client.get(URLS["ai"]).json()["posts"][0]["title"] == "Fresh"
+
+def test_delete_drops_the_post_and_its_listings(client):
+    warm(client)
+    assert client.delete("/api/blog/post-3").status_code == 200
+
+    assert cached(client) == {"ai", "post-0"}
+    assert client.get(URLS["post-3"]).status_code == 404
+    assert client.get(URLS["backend"]).json()["total"] == 2
@@ -0,0 +1,122 @@
+"""Two workers' GenerationWatchers sharing one database.
+
+Runs against mongomock_motor; skipped when it is not installed.
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("mongomock_motor")
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from mongomock_motor import AsyncMongoMockClient
+
+import coherence
+from coherence import GenerationWatcher
+
+class Worker:
+    """A watcher plus a record of the ids its blog_posts listener was handed"""
+
+    def __init__(self):
+        self.watcher = GenerationWatcher()
+        self.notified = []
+        self.watcher.on_change("blog_posts", self.listener)
+
+    async def listener(self, db, ids):
+        self.notified.append(ids)
+
+@pytest.fixture
+def db():
+    return AsyncMongoMockClient()["portfolio_coherence"]
+
+def run(db, scenario):
+    async def main():
+        writer, reader = Worker(), Worker()
+        # Both take their baseline before any write
+        await writer.watcher.check(db)
+        await reader.watcher.check(db)
+        await scenario(writer, reader)
+        return writer, reader
+    return asyncio.run(main())
+
+def test_reader_is_handed_the_ids_of_contiguous_bumps(db):
+    async def scenario(writer, reader):
+        await writer.watcher.bump(db, "blog_posts", ["post-1"])
+        await writer.watcher.bump(db, "blog_posts", ["post-2", "post-1"])
+        await reader.watcher.check(db)
+        await reader.watcher.check(db)
+
+    writer, reader = run(db, scenario)
+    assert reader.notified == [["post-1", "post-2"]]
+    assert reader.watcher.seen["blog_posts"] == 2
+    assert reader.watcher.stats()["invalidations"] == 1
+
+def test_baseline_check_notifies_nobody(db):
+    async def scenario(writer, reader):
+        await writer.watcher.bump(db, "blog_posts", ["post-1"])
+        late = Worker()
+        await late.watcher.check(db)
+        assert late.notified == []
+        assert late.watcher.seen["blog_posts"] == 1
+
+    run(db, scenario)
+
+def test_gap_longer_than_the_change_log_refreshes_everything(db, monkeypatch):
+    monkeypatch.setattr(coherence, "CHANGE_LOG_LENGTH", 3)
+
+    async def scenario(writer, reader):
+        for i in range(5):
+            await writer.watcher.bump(db, "blog_posts", [f"post-{i}"])
+        await reader.watcher.check(db)
+
+    writer, reader = run(db, scenario)
+    assert reader.notified == [None]
+    assert reader.watcher.seen["blog_posts"] == 5
+
+def test_gap_within_the_change_log_keeps_the_ids(db, monkeypatch):
+    monkeypatch.setattr(coherence, "CHANGE_LOG_LENGTH", 3)
+
+    async def scenario(writer, reader):
+        for i in range(5):
+            await writer.watcher.bump(db, "blog_posts", [f"post-{i}"])
+            if i == 1:
+                await reader.watcher.check(db)
+        await reader.watcher.check(db)
+
+    writer, reader = run(db, scenario)
+    assert reader.notified == [["post-0", "post-1"], ["post-2", "post-3", "post-4"]]
+
+def test_write_of_unknown_documents_refreshes_everything(db):
+    async def scenario(writer, reader):
+        await writer.watcher.bump(db, "blog_posts", ["post-1"])
+        await writer.watcher.bump(db, "blog_posts")
+        await reader.watcher.check(db)
+
+    writer, reader = run(db, scenario)
+    assert reader.notified == [None]
+
+def test_worker_skips_its_own_bumps(db):
+    async def scenario(writer, reader):
+        await writer.watcher.bump(db, "blog_posts", ["post-1"])
+        await writer.watcher.bump(db, "blog_posts", ["post-2"])
+        await writer.watcher.check(db)
+
+    writer, reader = run(db, scenario)
+    assert writer.notified == []
+    assert writer.watcher.seen["blog_posts"] == 2
+
+def test_write_slipping_between_own_bumps_is_picked_up_on_the_next_poll(db):
+    async def scenario(writer, reader):
+        await writer.watcher.bump(db, "blog_posts", ["post-1"])
+        await reader.watcher.bump(db, "blog_posts", ["post-2"])
+        await writer.watcher.bump(db, "blog_posts", ["post-3"])
+        await writer.watcher.check(db)
+
+    writer, reader = run(db, scenario)
+    assert writer.notified == [["post-2", "post-3"]]
+    assert writer.watcher.seen["blog_posts"] == 3
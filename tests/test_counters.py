@@ -0,0 +1,75 @@
+"""Counters kept by the write paths must match a database that already holds data.
+
+Runs against mongomock_motor; skipped when it is not installed.
+"""
+import asyncio
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("mongomock_motor")
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from mongomock_motor import AsyncMongoMockClient
+
+from counters import facet_deltas, increment_blog_facets, increment_contact_stats, load_blog_facets, load_contact_stats
+
+def contact(i: int, status: str) -> dict:
+    return {"id": f"contact-{i}", "status": status, "created_at": datetime(2024, 1, 1)}
+
+@pytest.fixture
+def db():
+    return AsyncMongoMockClient()["portfolio_counters"]
+
+def test_first_contact_write_after_deploy_counts_existing_contacts(db):
+    async def scenario():
+        await db.contacts.insert_many([contact(i, "read" if i % 4 else "new") for i in range(1000)])
+
+        # First write since the counters were introduced
+        await db.contacts.insert_one(contact(1000, "new"))
+        await increment_contact_stats(db, {"new": 1})
+        return await load_contact_stats(db)
+
+    stats = asyncio.run(scenario())
+    assert stats["total"] == 1001
+    assert stats["by_status"] == {"new": 251, "read": 750}
+
+def test_first_write_being_a_delete_never_goes_negative(db):
+    async def scenario():
+        await db.contacts.insert_many([contact(i, "new") for i in range(10)])
+
+        await db.contacts.delete_one({"id": "contact-0"})
+        await increment_contact_stats(db, {"new": -1})
+        await db.contacts.update_one({"id": "contact-1"}, {"$set": {"status": "read"}})
+        await increment_contact_stats(db, {"new": -1, "read": 1})
+        return await load_contact_stats(db)
+
+    stats = asyncio.run(scenario())
+    assert stats["total"] == 9
+    assert stats["by_status"] == {"new": 8, "read": 1}
+
+def post(i: int, category: str, tags: list, published: bool = True) -> dict:
+    return {"id": f"post-{i}", "category": category, "tags": tags, "published": published}
+
+def test_first_blog_write_after_deploy_counts_existing_posts(db):
+    async def scenario():
+        await db.blog_posts.insert_many(
+            [post(i, "AI", ["Python"]) for i in range(30)]
+            + [post(i, "Backend", ["Node.js"]) for i in range(30, 50)]
+            + [post(50, "AI", ["Draft"], published=False)]
+        )
+
+        # First write since the counters were introduced is a delete
+        deleted = await db.blog_posts.find_one_and_delete({"id": "post-0"})
+        await increment_blog_facets(db, facet_deltas(before=deleted))
+        return await load_blog_facets(db)
+
+    facets = asyncio.run(scenario())
+    assert facets["total"] == 49
+    assert facets["categories"] == {"AI": 29, "Backend": 20}
+    assert facets["tags"] == {"Python": 29, "Node.js": 20}
@@ -0,0 +1,143 @@
+"""Cursor pagination of the blog and contact listings.
+
+Pages through the routes by next_cursor against mongomock_motor; skipped
+when it is not installed.
+"""
+import asyncio
+import base64
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
+
+import pytest
+
+pytest.importorskip("mongomock_motor")
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from fastapi.testclient import TestClient
+from mongomock_motor import AsyncMongoMockClient
+
+import database
+from cache import blog_cache
+
+BASE = datetime(2024, 1, 1)
+CATEGORIES = ["AI", "Backend", "Frontend"]
+STATUSES = ["new", "read", "responded"]
+
+def post(i: int) -> dict:
+    # Three posts share every created_at, so ties are broken by id
+    created_at = BASE + timedelta(hours=i // 3)
+    return {
+        "id": f"post-{i:03d}", "title": f"Post {i}", "slug": f"post-{i}", "excerpt": "Excerpt",
+        "content": "Content", "author": "Amit", "category": CATEGORIES[i % len(CATEGORIES)], "tags": [],
+        "image": None, "read_time": None, "published": i % 4 != 0,
+        "created_at": created_at, "updated_at": created_at
+    }
+
+def contact(i: int) -> dict:
+    created_at = BASE + timedelta(hours=i // 3)
+    return {
+        "id": f"contact-{i:03d}", "name": "Name", "email": "name@example.com", "subject": "Subject",
+        "message": "Message", "status": STATUSES[i % len(STATUSES)],
+        "created_at": created_at, "updated_at": created_at
+    }
+
+def listing_order(docs: list) -> list:
+    return [doc["id"] for doc in sorted(docs, key=lambda doc: (doc["created_at"], doc["id"]), reverse=True)]
+
+@pytest.fixture
+def db(monkeypatch):
+    db = AsyncMongoMockClient()["portfolio_pagination"]
+    monkeypatch.setattr(database, "database", db)
+    blog_cache.clear()
+    yield db
+    blog_cache.clear()
+
+@pytest.fixture
+def client(db):
+    import server
+
+    # Without the context manager the startup hooks never connect to a real mongod
+    return TestClient(server.app)
+
+def insert(db, collection: str, docs: list):
+    asyncio.run(db[collection].insert_many([dict(doc) for doc in docs]))
+
+def walk(client, url: str, key: str, per_page: int, filters: Optional[dict] = None, on_page=None) -> list:
+    """Follow next_cursor from the first page to the last, returning every id seen"""
+    ids = []
+    cursor = None
+    while True:
+        params = {**(filters or {}), "per_page": per_page}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get(url, params=params)
+        assert response.status_code == 200, response.text
+        page = response.json()
+        ids.extend(item["id"] for item in page[key])
+        if on_page:
+            on_page(page)
+        if not page["has_next"]:
+            assert page["next_cursor"] is None
+            return ids
+        assert len(page[key]) == per_page
+        cursor = page["next_cursor"]
+
+@pytest.mark.parametrize("per_page", [5, 8])
+def test_blog_listing_pages_by_cursor_without_gaps_or_duplicates(db, client, per_page):
+    posts = [post(i) for i in range(24)]
+    insert(db, "blog_posts", posts)
+
+    ids = walk(client, "/api/blog", "posts", per_page, {"published_only": "false"})
+    assert ids == listing_order(posts)
+
+    published = [doc for doc in posts if doc["published"]]
+    assert walk(client, "/api/blog", "posts", per_page) == listing_order(published)
+
+    in_category = [doc for doc in published if doc["category"] == "AI"]
+    assert walk(client, "/api/blog/category/AI", "posts", per_page) == listing_order(in_category)
+
+def test_blog_cursor_is_not_shifted_by_newer_posts(db, client):
+    posts = [post(i) for i in range(24)]
+    insert(db, "blog_posts", posts)
+    pages = []
+
+    def add_newer_post(page):
+        pages.append(page)
+        if len(pages) == 1:
+            insert(db, "blog_posts", [post(100)])
+
+    ids = walk(client, "/api/blog", "posts", 5, {"published_only": "false"}, on_page=add_newer_post)
+    assert ids == listing_order(posts)
+
+@pytest.mark.parametrize("per_page", [5, 9])
+def test_contact_listing_pages_by_cursor_without_gaps_or_duplicates(db, client, per_page):
+    contacts = [contact(i) for i in range(27)]
+    insert(db, "contacts", contacts)
+
+    assert walk(client, "/api/contact", "contacts", per_page) == listing_order(contacts)
+
+    read = [doc for doc in contacts if doc["status"] == "read"]
+    assert walk(client, "/api/contact", "contacts", per_page, {"status": "read"}) == listing_order(read)
+
+def test_last_page_reports_no_next_page(db, client):
+    insert(db, "blog_posts", [post(i) for i in range(1, 4)])
+
+    page = client.get("/api/blog", params={"per_page": 3}).json()
+    assert len(page["posts"]) == 3
+    assert page["has_next"] is False
+    assert page["next_cursor"] is None
+
+@pytest.mark.parametrize("cursor", [
+    "not-a-cursor",
+    base64.urlsafe_b64encode(b'{"i": "post-001"}').decode(),
+    base64.urlsafe_b64encode(b'{"t": "yesterday", "i": "post-001"}').decode(),
+])
+@pytest.mark.parametrize("url", ["/api/blog", "/api/blog/category/AI", "/api/contact"])
+def test_malformed_cursor_is_rejected(db, client, url, cursor):
+    response = client.get(url, params={"cursor": cursor})
+    assert response.status_code == 400
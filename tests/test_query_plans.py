@@ -0,0 +1,195 @@
+"""Explain-plan checks for the queries the routes send.
+
+Each route's filter and sort is explained against a mongod carrying the
+indexes from database.INDEXES. A plan that scans the collection or sorts
+in memory means the index set no longer matches the query shape.
+
+Needs a running mongod (MONGO_TEST_URL, default mongodb://localhost:27017);
+the tests skip otherwise.
+"""
+import os
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+
+import database
+from export import export_query
+from models.blog import BlogCategory, SearchMode
+from models.contact import ContactStatus
+from pagination import SORT_ORDER, apply_cursor, encode_cursor, facet_pipeline
+from routes.blog import build_list_query
+from routes.contact import build_contact_query
+
+MONGO_TEST_URL = os.environ.get("MONGO_TEST_URL", "mongodb://localhost:27017")
+PLANS_DB_NAME = "portfolio_query_plans"
+PER_PAGE = 10
+
+@pytest.fixture(scope="module")
+def db():
+    client = MongoClient(MONGO_TEST_URL, serverSelectionTimeoutMS=1000)
+    try:
+        client.admin.command("ping")
+    except PyMongoError:
+        pytest.skip(f"no mongod at {MONGO_TEST_URL}")
+
+    client.drop_database(PLANS_DB_NAME)
+    db = client[PLANS_DB_NAME]
+    for name, indexes in database.INDEXES.items():
+        db[name].create_indexes(indexes)
+
+    # Enough documents that a collection scan is never the cheap option
+    base = datetime(2024, 1, 1)
+    categories = [category.value for category in BlogCategory]
+    statuses = [status.value for status in ContactStatus]
+    db.blog_posts.insert_many([{
+        "id": f"post-{i}", "slug": f"post-{i}", "title": f"Post {i}", "excerpt": "Excerpt",
+        "content": "Content", "tags": ["Python"], "category": categories[i % len(categories)],
+        "published": i % 4 != 0, "created_at": base + timedelta(hours=i // 2), "updated_at": base
+    } for i in range(500)])
+    db.contacts.insert_many([{
+        "id": f"contact-{i}", "name": "Name", "email": "name@example.com", "subject": "Subject",
+        "message": "Message", "status": statuses[i % len(statuses)],
+        "created_at": base + timedelta(hours=i // 2), "updated_at": base
+    } for i in range(500)])
+    db.projects.insert_many([{"id": f"project-{i}", "order": i} for i in range(50)])
+
+    yield db
+
+    client.drop_database(PLANS_DB_NAME)
+    client.close()
+
+def plan_stages(plan: dict) -> list:
+    """Stage names of a winning plan and all its inputs"""
+    plan = plan.get("queryPlan", plan)
+    stages = [plan["stage"]]
+    for child in [plan.get("inputStage")] + plan.get("inputStages", []):
+        if child:
+            stages.extend(plan_stages(child))
+    return stages
+
+def find_stages(collection, query: dict, sort=None, limit: int = PER_PAGE + 1) -> list:
+    cursor = collection.find(query)
+    if sort:
+        cursor = cursor.sort(sort)
+    return plan_stages(cursor.limit(limit).explain()["queryPlanner"]["winningPlan"])
+
+def count_stages(collection, query: dict) -> list:
+    explained = collection.database.command("explain", {"count": collection.name, "query": query})
+    return plan_stages(explained["queryPlanner"]["winningPlan"])
+
+def aggregate_stages(collection, pipeline: list) -> list:
+    """Stage names of the query plan feeding an aggregation"""
+    explained = collection.database.command(
+        "explain", {"aggregate": collection.name, "pipeline": pipeline, "cursor": {}}, verbosity="queryPlanner"
+    )
+    if "queryPlanner" not in explained:
+        # Only the leading $match/$sort was pushed down; its plan sits in the $cursor stage
+        explained = explained["stages"][0]["$cursor"]
+    return plan_stages(explained["queryPlanner"]["winningPlan"])
+
+def seek(collection, query: dict) -> dict:
+    """The query for the page after the first one, as a cursor request sends it"""
+    last = collection.find(query).sort(SORT_ORDER).skip(PER_PAGE - 1).limit(1).next()
+    return apply_cursor(query, encode_cursor(last))
+
+BLOG_LISTINGS = {
+    "all published": (True, None, None),
+    "all posts": (False, None, None),
+    "published in category": (True, BlogCategory.AI, None),
+    "category including drafts": (False, BlogCategory.AI, None),
+    "published substring search": (True, None, "post"),
+    "substring search including drafts": (False, None, "post"),
+}
+
+@pytest.mark.parametrize("name", BLOG_LISTINGS)
+def test_blog_listing_uses_an_index_for_filter_and_sort(db, name):
+    published_only, category, search = BLOG_LISTINGS[name]
+    query, sort = build_list_query(published_only, category, search, SearchMode.SUBSTRING)
+
+    for shape in (query, seek(db.blog_posts, query)):
+        stages = find_stages(db.blog_posts, shape, sort)
+        assert "IXSCAN" in stages, stages
+        assert "COLLSCAN" not in stages, stages
+        assert "SORT" not in stages, stages
+
+@pytest.mark.parametrize("name", [name for name, (_, _, search) in BLOG_LISTINGS.items() if not search])
+def test_blog_listing_count_uses_an_index(db, name):
+    published_only, category, _ = BLOG_LISTINGS[name]
+    query, _ = build_list_query(published_only, category)
+    if query:
+        assert "COLLSCAN" not in count_stages(db.blog_posts, query)
+
+@pytest.mark.parametrize("collection, query, sort", [
+    *(("blog_posts", *build_list_query(published_only, category, search, SearchMode.SUBSTRING))
+      for published_only, category, search in BLOG_LISTINGS.values()),
+    ("contacts", build_contact_query(), SORT_ORDER),
+    ("contacts", build_contact_query(ContactStatus.NEW), SORT_ORDER),
+])
+def test_facet_count_pipeline_uses_an_index_for_filter_and_sort(db, collection, query, sort):
+    # count=facet sends this aggregate instead of a find and a count
+    stages = aggregate_stages(db[collection], facet_pipeline(query, sort, 0, PER_PAGE + 1, {"_id": 0}))
+    assert "IXSCAN" in stages, stages
+    assert "COLLSCAN" not in stages, stages
+    assert "SORT" not in stages, stages
+
+def test_blog_text_search_uses_the_text_index(db):
+    query, sort = build_list_query(True, BlogCategory.AI, "post excerpt", SearchMode.TEXT)
+
+    # Relevance order is computed per search, so only the scan is checked
+    stages = find_stages(db.blog_posts, query, sort)
+    assert "TEXT_MATCH" in stages or "TEXT" in stages, stages
+    assert "COLLSCAN" not in stages, stages
+
+def test_blog_text_search_matches_tags(db):
+    # "Python" only appears in the seeded posts' tags
+    query, _ = build_list_query(True, None, "python", SearchMode.TEXT)
+    assert db.blog_posts.count_documents(query) == 375
+
+def test_blog_search_without_terms_matches_nothing(db):
+    query, sort = build_list_query(True, None, "-- \"\"", SearchMode.TEXT)
+    assert db.blog_posts.count_documents(query) == 0
+    assert "COLLSCAN" not in find_stages(db.blog_posts, query, sort)
+
+@pytest.mark.parametrize("status", [None, ContactStatus.NEW])
+def test_contact_listing_uses_an_index_for_filter_and_sort(db, status):
+    query = build_contact_query(status)
+
+    for shape in (query, seek(db.contacts, query)):
+        stages = find_stages(db.contacts, shape, SORT_ORDER)
+        assert "IXSCAN" in stages, stages
+        assert "COLLSCAN" not in stages, stages
+        assert "SORT" not in stages, stages
+    if query:
+        assert "COLLSCAN" not in count_stages(db.contacts, query)
+
+@pytest.mark.parametrize("collection, query", [
+    ("contacts", build_contact_query()),
+    ("blog_posts", build_list_query(False)[0]),
+])
+def test_exports_walk_the_updated_at_index(db, collection, query):
+    for since in (None, datetime(2024, 1, 5)):
+        shape, sort = export_query(query, since)
+        stages = find_stages(db[collection], shape, sort, limit=0)
+        assert "IXSCAN" in stages, stages
+        assert "COLLSCAN" not in stages, stages
+        assert "SORT" not in stages, stages
+
+@pytest.mark.parametrize("collection, query", [
+    ("blog_posts", {"slug": "post-7"}),
+    ("blog_posts", {"id": "post-7"}),
+    ("contacts", {"id": "contact-7"}),
+    ("projects", {"id": "project-7"}),
+])
+def test_point_lookups_use_an_index(db, collection, query):
+    stages = find_stages(db[collection], query, limit=1)
+    assert "COLLSCAN" not in stages, stages
+    assert "IXSCAN" in stages or "IDHACK" in stages or "EXPRESS_IXSCAN" in stages, stages